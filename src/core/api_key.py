@@ -1,68 +1,204 @@
-from typing import Optional
-from datetime import datetime
-from src.models.base import get_db
+import asyncio
+import logging
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+from fastapi import Depends, HTTPException
+from fastapi.security import APIKeyHeader
+from src.models.base import SessionLocal, get_db
 from src.models.api_key import APIKey
-from src.models.project import Project
-from src.utils.api_key import generate_api_key, hash_key, verify_key_hash
-from sqlalchemy.orm import Session
+from src.utils.api_key import cache_key, generate_api_key, hash_key, validate_key_format
+from src.utils.cache import TTLCache
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
-def create_api_key(project_id: str, db: Session) -> tuple[APIKey, str]:
-    """Create and save a new API key for a project. Returns (api_key, key_string)."""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise ValueError("Project not found")
 
-    existing_key = db.query(APIKey).filter(APIKey.project_id == project_id).first()
-    if existing_key:
-        existing_key.is_active = False
-        db.commit()
+class CachedAPIKey(NamedTuple):
+    """Session-independent snapshot of an authenticated API key."""
+    id: uuid.UUID
+    project_id: uuid.UUID
+    is_active: bool
+    key_hash: str
+
+
+# Authenticated keys by cache_key(key): a short blake2b digest is cheaper to
+# compute on a hit than the SHA-256 hex digest needed for the database.
+# The TTL bounds how long a key revoked through another worker process can
+# keep authenticating.
+_AUTH_CACHE: TTLCache[bytes, CachedAPIKey] = TTLCache(maxsize=10_000, ttl=60)
+
+logger = logging.getLogger(__name__)
+
+api_key_scheme = APIKeyHeader(name="X-API-Key")
+
+# last_used_at only needs to be approximately right: authenticated requests
+# record it here and a background task writes one row per key every
+# USAGE_FLUSH_INTERVAL seconds instead of one UPDATE per request.
+# Only touched from the event loop, so no lock is needed.
+USAGE_FLUSH_INTERVAL = 30
+_LAST_USED: dict[uuid.UUID, datetime] = {}
+
+# PostgreSQL SQLSTATE of a unique constraint violation
+_UNIQUE_VIOLATION = "23505"
+
+# Built once so each call only binds parameters instead of rebuilding the query.
+# Callers only read columns: raiseload("*") turns any lazy relationship load
+# into an error instead of a hidden extra query.
+_STMT_ACTIVE_BY_HASH = (
+    select(APIKey)
+    .where(APIKey.key_hash == bindparam("key_hash"), APIKey.is_active == True)
+    .options(raiseload("*"))
+    .limit(1)
+)
+_STMT_ACTIVE_BY_PROJECT = (
+    select(APIKey)
+    .where(APIKey.project_id == bindparam("project_id"), APIKey.is_active == True)
+    .options(raiseload("*"))
+)
+_STMT_DEACTIVATE_BY_PROJECT = (
+    update(APIKey)
+    .where(APIKey.project_id == bindparam("project_id"), APIKey.is_active == True)
+    .values(is_active=False)
+    .returning(APIKey.key_hash)
+    .execution_options(synchronize_session=False)
+)
+
+
+def _evict_cached_keys(key_hashes: Sequence[str]) -> None:
+    """Drop deactivated keys from the auth cache."""
+    if key_hashes:
+        revoked = set(key_hashes)
+        _AUTH_CACHE.remove_where(lambda cached: cached.key_hash in revoked)
+
+def evict_project_keys(project_id: uuid.UUID) -> None:
+    """Drop every cached key of a project, e.g. once the project is deleted."""
+    _AUTH_CACHE.remove_where(lambda cached: cached.project_id == project_id)
+
+async def create_api_key(project_id: uuid.UUID, db: AsyncSession) -> tuple[APIKey, str]:
+    """Create and save a new API key for a project. Returns (api_key, key_string)."""
+    # Deactivate the previous key and insert the new one in a single
+    # transaction; the project_id foreign key rejects unknown projects.
+    replaced_hashes = (await db.scalars(_STMT_DEACTIVATE_BY_PROJECT, {"project_id": project_id})).all()
 
     key = generate_api_key()
     key_hash = hash_key(key)
 
+    # created_at is set by the database (server_default) and returned by the INSERT
     api_key = APIKey(
         key_hash=key_hash,
         project_id=project_id,
         is_active=True,
-        created_at=datetime.now()
     )
 
     db.add(api_key)
-    db.commit()
-    db.refresh(api_key)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        # Another rotation committed an active key first
+        # (ix_api_keys_project_active); otherwise the project is gone
+        if getattr(e.orig, "sqlstate", None) == _UNIQUE_VIOLATION:
+            raise HTTPException(status_code=409, detail="API key was changed concurrently, retry")
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    _evict_cached_keys(replaced_hashes)
 
     return api_key, key
 
-def get_api_key_by_key(key: str, db: Session) -> Optional[APIKey]:
+async def get_api_key_by_key(key: str, db: AsyncSession) -> Optional[CachedAPIKey]:
     """Get API key by key string for authentication."""
-    # First get all potential matches by key_hash
+    # A key that generate_api_key could not have produced cannot exist:
+    # reject it without touching the cache or the database.
+    if not validate_key_format(key):
+        return None
+
+    key_digest = cache_key(key)
+    cached = _AUTH_CACHE.get(key_digest)
+    if cached is not None:
+        return cached
+
+    # The equality filter on key_hash already proves the key matches,
+    # so hashing it a second time to verify would be redundant.
     key_hash = hash_key(key)
-    api_key = db.query(APIKey).filter(APIKey.key_hash == key_hash, APIKey.is_active == True).first()
+    api_key = await db.scalar(_STMT_ACTIVE_BY_HASH, {"key_hash": key_hash})
+    if not api_key:
+        return None
+
+    cached = CachedAPIKey(
+        id=api_key.id,
+        project_id=api_key.project_id,
+        is_active=api_key.is_active,
+        key_hash=api_key.key_hash,
+    )
+    _AUTH_CACHE.set(key_digest, cached)
+    return cached
+
+async def get_api_key_dep(
+    api_key: str = Depends(api_key_scheme), db: AsyncSession = Depends(get_db)
+) -> CachedAPIKey:
+    """Authenticate API key and return API key object.
+
+    Shared by every API-key route so FastAPI resolves it once per request.
+    """
+    api_key_obj = await get_api_key_by_key(api_key, db)
+    if not api_key_obj:
+        raise HTTPException(status_code=403, detail="Invalid API Key")
+    if not api_key_obj.is_active:
+        raise HTTPException(status_code=403, detail="API Key is not active")
+    record_api_key_usage(api_key_obj.id)
+    return api_key_obj
 
-    if api_key and verify_key_hash(key, api_key.key_hash):
-        return api_key
+def record_api_key_usage(api_key_id: uuid.UUID) -> None:
+    """Note that an API key was used; persisted by the next usage flush."""
+    _LAST_USED[api_key_id] = datetime.now(timezone.utc)
 
-    return None
+async def flush_api_key_usage() -> None:
+    """Write every pending last_used_at in one executemany UPDATE."""
+    global _LAST_USED
+    pending, _LAST_USED = _LAST_USED, {}
+    if not pending:
+        return
 
-def get_api_key_by_project(project_id: str, db: Session) -> Optional[APIKey]:
+    try:
+        async with SessionLocal() as db:
+            # ORM bulk UPDATE by primary key
+            await db.execute(
+                update(APIKey),
+                [{"id": key_id, "last_used_at": used_at} for key_id, used_at in pending.items()],
+            )
+            await db.commit()
+    except Exception:
+        logger.exception("Failed to record usage for %d API keys", len(pending))
+
+async def run_usage_flusher() -> None:
+    """Background task: periodically persist recorded API key usage."""
+    try:
+        while True:
+            await asyncio.sleep(USAGE_FLUSH_INTERVAL)
+            await flush_api_key_usage()
+    finally:
+        # Write what was recorded since the last flush before shutting down
+        await flush_api_key_usage()
+
+async def get_api_key_by_project(project_id: uuid.UUID, db: AsyncSession) -> Optional[APIKey]:
     """Get active API key by project ID."""
-    return db.query(APIKey).filter(APIKey.project_id == project_id, APIKey.is_active == True).first()
+    return await db.scalar(_STMT_ACTIVE_BY_PROJECT, {"project_id": project_id})
 
-def reset_api_key(project_id: str, db: Session) -> APIKey:
+async def reset_api_key(project_id: uuid.UUID, db: AsyncSession) -> tuple[APIKey, str]:
     """Reset API key for a project (deactivate old, create new)."""
-    return create_api_key(project_id, db)
+    return await create_api_key(project_id, db)
 
-def deactivate_api_key(project_id: str, db: Session) -> bool:
+async def deactivate_api_key(project_id: uuid.UUID, db: AsyncSession) -> bool:
     """Deactivate API key for a project."""
-    api_key = db.query(APIKey).filter(APIKey.project_id == project_id, APIKey.is_active == True).first()
-    if not api_key:
-        return False
+    key_hashes = (await db.scalars(_STMT_DEACTIVATE_BY_PROJECT, {"project_id": project_id})).all()
+    await db.commit()
 
-    api_key.is_active = False
-    api_key.updated_at = datetime.now()
-    db.commit()
-    return True
+    _evict_cached_keys(key_hashes)
+    return bool(key_hashes)
 
-def get_active_api_keys(project_id: str, db: Session) -> list[APIKey]:
+async def get_active_api_keys(project_id: uuid.UUID, db: AsyncSession) -> list[APIKey]:
     """Get all active API keys for a project."""
-    return db.query(APIKey).filter(APIKey.project_id == project_id, APIKey.is_active == True).all()
\ No newline at end of file
+    return list(await db.scalars(_STMT_ACTIVE_BY_PROJECT, {"project_id": project_id}))
\ No newline at end of file
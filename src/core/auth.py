@@ -2,36 +2,35 @@ from datetime import timedelta, datetime, timezone
 from typing import Optional
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.base import get_db
 from src.models.user import User
 from src.core.config import settings
-from src.utils.hash import hash_password, verify_password
-from src.utils.maybe import Maybe, Nothing, Some
+from src.utils.hash import hash_password_async, verify_password_async
+from src.utils.maybe import NOTHING, Maybe, Some
 from src.utils.result import Result, Err, Ok
 from jose import JWTError, jwt
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Requête construite une seule fois : chaque appel ne fait que lier l'email
+_STMT_USER_BY_EMAIL = select(User).where(User.email == bindparam("email")).limit(1)
 
-def get_user_by_email(email: str, db: Session = None) -> Maybe[User]:
-    database = db or get_db()
 
-    user = database.query(User).filter(User.email == email).first()
-    return Nothing() if user is None else Some(user)
+async def get_user_by_email(email: str, db: AsyncSession) -> Maybe[User]:
+    user = await db.scalar(_STMT_USER_BY_EMAIL, {"email": email})
+    return NOTHING if user is None else Some(user)
 
 
-def create_user(
-    email: str, password: str, username: str, db: Session = None
+async def create_user(
+    email: str, password: str, username: str, db: AsyncSession
 ) -> Result[User, HTTPException]:
-    database = db or get_db()
-
-    existing_user = get_user_by_email(email, database)
+    existing_user = await get_user_by_email(email, db)
     if existing_user.is_some():
         return Err(HTTPException(status_code=400, detail="Email already registered"))
 
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password_async(password)
 
     user = User(
         email=email,
@@ -39,25 +38,24 @@ def create_user(
         display_name=username
     )
 
-    database.add(user)
-    database.commit()
-    database.refresh(user)
+    db.add(user)
+    await db.commit()
 
     return Ok(user)
 
 
-def authenticate_user(email: str, password: str, db: Session) -> Maybe[User]: 
-    user = get_user_by_email(email, db)
+async def authenticate_user(email: str, password: str, db: AsyncSession) -> Maybe[User]:
+    user = await get_user_by_email(email, db)
 
     if user.is_nothing():
-        return Nothing()
+        return NOTHING
 
     user_instance = user.unwrap()
-    if not verify_password(password, user_instance.password_hash):
-        return Nothing()
+    if not await verify_password_async(password, user_instance.password_hash):
+        return NOTHING
 
     user_instance.last_login = func.now()
-    db.commit()
+    await db.commit()
 
     return Some(user_instance)
 
@@ -75,7 +73,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -89,7 +89,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
 
-    user = get_user_by_email(email, next(get_db()))
+    user = await get_user_by_email(email, db)
     if user.is_nothing():
         raise credentials_exception
 
@@ -1,27 +1,140 @@
+import uuid
 from collections.abc import Sequence
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from sqlalchemy import bindparam, delete, exists, insert, select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from typing import List, Optional
-from src.models.base import get_db
 from src.models.project import Project
 from src.models.log import Log, LogLevel
 from src.models.user import User
-from src.core.project import check_project_ownership
+from src.core.log_writer import enqueue_log
 from src.utils.result import Result, Ok, Err
+from src.utils.cursor import Cursor
 from fastapi import HTTPException, status
 
+# Pagination par clé (created_at, id) : chaque page est une recherche d'index
+# bornée par LIMIT au lieu de charger toutes les lignes du projet
+_AFTER_CURSOR = tuple_(Log.created_at, Log.id) < tuple_(
+    bindparam("cursor_created_at", type_=Log.created_at.type),
+    bindparam("cursor_id", type_=Log.id.type),
+)
+
+
+def _paginated(stmt):
+    """Renvoie les variantes première page / page suivante d'une requête de liste"""
+    stmt = stmt.limit(bindparam("limit"))
+    return stmt, stmt.where(_AFTER_CURSOR)
+
+
+# Requêtes construites une seule fois : chaque appel ne fait que lier les paramètres.
+# LogResponse ne sérialise que des colonnes (tags compris, c'est un ARRAY) :
+# raiseload("*") interdit tout chargement paresseux de relation, pour
+# qu'une liste ne tombe pas en N+1 si un champ en ajoutait une.
+# Le contrôle d'accès fait partie de la requête de liste : une seule requête
+# quand le projet appartient à l'utilisateur
+_STMT_LOGS_BY_PROJECT = (
+    select(Log)
+    .where(
+        Log.project_id == bindparam("project_id"),
+        Log.project_id.in_(
+            select(Project.id).where(
+                Project.id == bindparam("project_id"),
+                Project.owner_id == bindparam("user_id"),
+            )
+        ),
+    )
+    .order_by(Log.created_at.desc(), Log.id.desc())
+    .options(raiseload("*"))
+)
+_STMT_PROJECT_OWNED = select(
+    exists().where(
+        Project.id == bindparam("project_id"), Project.owner_id == bindparam("user_id")
+    )
+)
+_STMT_LOG_BY_ID = (
+    select(Log)
+    .join(Project)
+    .where(Log.id == bindparam("log_id"), Project.owner_id == bindparam("user_id"))
+    .options(raiseload("*"))
+    .limit(1)
+)
+_PAGES_LOGS_BY_PROJECT = _paginated(_STMT_LOGS_BY_PROJECT)
+_PAGES_LOGS_BY_LEVEL = _paginated(_STMT_LOGS_BY_PROJECT.where(Log.level == bindparam("level")))
+_PAGES_LOGS_BY_CATEGORY = _paginated(_STMT_LOGS_BY_PROJECT.where(Log.category == bindparam("category")))
+_PAGES_LOGS_BY_TAG = _paginated(_STMT_LOGS_BY_PROJECT.where(Log.tags.contains(bindparam("tags"))))
+_STMT_DELETE_LOG = (
+    delete(Log)
+    .where(
+        Log.id == bindparam("log_id"),
+        Log.project_id.in_(
+            select(Project.id).where(Project.owner_id == bindparam("user_id"))
+        ),
+    )
+    .execution_options(synchronize_session=False)
+)
+# INSERT en masse : renvoie des lignes brutes plutôt que des objets ORM
+_STMT_INSERT_LOGS = insert(Log).returning(*Log.__table__.columns)
+
+MAX_BULK_LOGS = 1000
+
+# Niveau en minuscules -> membre de l'enum stocké en base
+_LOG_LEVELS = {member.value: member for member in LogLevel}
+
+
+async def _fetch_page(
+    pages: tuple, params: dict, limit: int, cursor: Optional[Cursor], db: AsyncSession
+) -> Sequence[Log]:
+    """Exécute une requête de liste paginée à partir du curseur éventuel"""
+    first_page, next_page = pages
+    if cursor is None:
+        return (await db.scalars(first_page, {**params, "limit": limit})).all()
+
+    cursor_created_at, cursor_id = cursor
+    return (
+        await db.scalars(
+            next_page,
+            {
+                **params,
+                "limit": limit,
+                "cursor_created_at": cursor_created_at,
+                "cursor_id": cursor_id,
+            },
+        )
+    ).all()
+
+
+async def _fetch_owned_page(
+    pages: tuple,
+    params: dict,
+    project_id: uuid.UUID,
+    user_id: uuid.UUID,
+    limit: int,
+    cursor: Optional[Cursor],
+    db: AsyncSession,
+) -> Result[Sequence[Log], HTTPException]:
+    """Page de logs d'un projet appartenant à l'utilisateur, 404 sinon"""
+    access = {"project_id": project_id, "user_id": user_id}
+    logs = await _fetch_page(pages, {**params, **access}, limit, cursor, db)
+
+    # Une page vide peut aussi vouloir dire « pas d'accès » : on ne le vérifie que dans ce cas
+    if not logs and not await db.scalar(_STMT_PROJECT_OWNED, access):
+        return Err(
+            HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found or access denied",
+            )
+        )
 
-def validate_log_level(level: str) -> bool:
-    """Valide si le niveau de log est valide"""
-    return level.lower() in [member.value for member in LogLevel]
+    return Ok(logs)
 
 
-def create_log(
-    project_id: str, log_data: dict, db: Session
-) -> Result[Log, HTTPException]:
+def create_log(project_id: uuid.UUID, log_data: dict) -> Result[Log, HTTPException]:
     try:
-        # Vérifier si le projet existe et appartient à l'utilisateur
-        # Valider le niveau de log
-        if "level" in log_data and not validate_log_level(log_data["level"]):
+        # Valider le niveau de log (normalisé une seule fois)
+        level = _LOG_LEVELS.get(log_data.get("level", "info").lower())
+        if level is None:
             return Err(
                 HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -29,48 +142,101 @@ def create_log(
                 )
             )
 
-        # Créer le log
-        new_log = Log(
-            project_id=project_id,
-            level=log_data.get("level", "info").upper(),
-            category=log_data.get("category"),
-            message=log_data["message"],
-            tags=log_data.get("tags"),
+        # Créer le log : id et created_at sont fixés ici pour pouvoir répondre
+        # tout de suite, l'INSERT est fait plus tard par le writer en arrière-plan
+        row = {
+            "id": uuid.uuid4(),
+            "project_id": project_id,
+            "level": level,
+            "category": log_data.get("category"),
+            "message": log_data["message"],
+            "tags": log_data.get("tags"),
+            "created_at": datetime.now(timezone.utc),
+        }
+        if not enqueue_log(row):
+            return Err(
+                HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Log ingestion is overloaded, retry later",
+                )
+            )
+
+        return Ok(Log(**row))
+
+    except Exception as e:
+        return Err(
+            HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create log: {e}",
+            )
         )
 
-        db.add(new_log)
-        db.commit()
-        db.refresh(new_log)
 
-        return Ok(new_log)
+async def create_logs_bulk(
+    project_id: uuid.UUID, logs_data: List[dict], db: AsyncSession
+) -> Result[Sequence[Row], HTTPException]:
+    try:
+        if len(logs_data) > MAX_BULK_LOGS:
+            return Err(
+                HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Too many logs in one request. Maximum is {MAX_BULK_LOGS}",
+                )
+            )
+
+        # Valider tous les niveaux avant d'insérer quoi que ce soit, en
+        # préparant les lignes dans le même passage
+        rows = []
+        for log_data in logs_data:
+            level = _LOG_LEVELS.get(log_data.get("level", "info").lower())
+            if level is None:
+                return Err(
+                    HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid log level. Must be: info, debug, warning, error, critical",
+                    )
+                )
+            rows.append(
+                {
+                    "project_id": project_id,
+                    "level": level,
+                    "category": log_data.get("category"),
+                    "message": log_data["message"],
+                    "tags": log_data.get("tags"),
+                }
+            )
+
+        if not rows:
+            return Ok([])
+
+        # Créer tous les logs en une seule requête INSERT ... RETURNING
+        logs = (await db.execute(_STMT_INSERT_LOGS, rows)).all()
+        await db.commit()
+
+        return Ok(logs)
 
     except Exception as e:
         return Err(
             HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create log: {e}",
+                detail=f"Failed to create logs: {e}",
             )
         )
 
 
-def get_logs_by_project(
-    project_id: str, user_id: str, db: Session
+async def get_logs_by_project(
+    project_id: uuid.UUID,
+    user_id: uuid.UUID,
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
 ) -> Result[List[Log], HTTPException]:
     try:
-        # Vérifier si l'utilisateur a accès au projet
-        project_result = check_project_ownership(project_id, user_id, db)
-        if project_result.is_err():
-            return Err(project_result.unwrap_err())
-
-        logs = (
-            db.query(Log)
-            .filter(Log.project_id == project_id)
-            .order_by(Log.created_at.desc())
-            .all()
+        # Vérifier l'accès au projet dans la même requête
+        return await _fetch_owned_page(
+            _PAGES_LOGS_BY_PROJECT, {}, project_id, user_id, limit, cursor, db
         )
 
-        return Ok(logs)
-
     except Exception as e:
         return Err(
             HTTPException(
@@ -80,15 +246,10 @@ def get_logs_by_project(
         )
 
 
-def get_log_by_id(log_id: str, user_id: str, db: Session) -> Result[Log, HTTPException]:
+async def get_log_by_id(log_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession) -> Result[Log, HTTPException]:
     try:
         # Récupérer le log et vérifier l'accès au projet
-        log = (
-            db.query(Log)
-            .join(Project)
-            .filter(Log.id == log_id, Project.owner_id == user_id)
-            .first()
-        )
+        log = await db.scalar(_STMT_LOG_BY_ID, {"log_id": log_id, "user_id": user_id})
 
         if log is None:
             return Err(
@@ -109,19 +270,13 @@ def get_log_by_id(log_id: str, user_id: str, db: Session) -> Result[Log, HTTPExc
         )
 
 
-def update_log(
-    log_id: str, log_data: dict, user_id: str, db: Session
+async def update_log(
+    log_id: uuid.UUID, log_data: dict, user_id: uuid.UUID, db: AsyncSession
 ) -> Result[Log, HTTPException]:
     try:
-        # Vérifier si le log existe et l'utilisateur a les droits
-        log_result = get_log_by_id(log_id, user_id, db)
-        if log_result.is_err():
-            return Err(log_result.unwrap_err())
-
-        log = log_result.unwrap()
-
-        # Valider les données si fournies
-        if "level" in log_data and not validate_log_level(log_data["level"]):
+        # Valider les données si fournies, avant d'aller en base
+        level = _LOG_LEVELS.get(log_data["level"].lower()) if "level" in log_data else None
+        if "level" in log_data and level is None:
             return Err(
                 HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -129,9 +284,16 @@ def update_log(
                 )
             )
 
+        # Vérifier si le log existe et l'utilisateur a les droits
+        log_result = await get_log_by_id(log_id, user_id, db)
+        if not log_result.ok:
+            return Err(log_result.unwrap_err())
+
+        log = log_result.value
+
         # Mettre à jour les champs
-        if "level" in log_data:
-            log.level = log_data["level"].lower()
+        if level is not None:
+            log.level = level
         if "category" in log_data:
             log.category = log_data["category"]
         if "message" in log_data:
@@ -139,8 +301,7 @@ def update_log(
         if "tags" in log_data:
             log.tags = log_data["tags"]
 
-        db.commit()
-        db.refresh(log)
+        await db.commit()
 
         return Ok(log)
 
@@ -153,18 +314,19 @@ def update_log(
         )
 
 
-def delete_log(log_id: str, user_id: str, db: Session) -> Result[bool, HTTPException]:
+async def delete_log(log_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession) -> Result[bool, HTTPException]:
     try:
-        # Vérifier si le log existe et l'utilisateur a les droits
-        log_result = get_log_by_id(log_id, user_id, db)
-        if log_result.is_err():
-            return Err(log_result.unwrap_err())
-
-        log = log_result.unwrap()
+        # Supprimer le log en vérifiant les droits dans la même requête
+        result = await db.execute(_STMT_DELETE_LOG, {"log_id": log_id, "user_id": user_id})
+        await db.commit()
 
-        # Supprimer le log
-        db.delete(log)
-        db.commit()
+        if result.rowcount == 0:
+            return Err(
+                HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Log not found or access denied",
+                )
+            )
 
         return Ok(True)
 
@@ -177,32 +339,35 @@ def delete_log(log_id: str, user_id: str, db: Session) -> Result[bool, HTTPExcep
         )
 
 
-def get_logs_by_level(
-    project_id: str, level: str, user_id: str, db: Session
+async def get_logs_by_level(
+    project_id: uuid.UUID,
+    level: str,
+    user_id: uuid.UUID,
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
 ) -> Result[List[Log], HTTPException]:
     try:
         # Valider le niveau
-        if not validate_log_level(level):
+        level_member = _LOG_LEVELS.get(level.lower())
+        if level_member is None:
             return Err(
                 HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid log level"
                 )
             )
 
-        # Vérifier si l'utilisateur a accès au projet
-        project_result = check_project_ownership(project_id, user_id, db)
-        if project_result.is_err():
-            return Err(project_result.unwrap_err())
-
-        logs = (
-            db.query(Log)
-            .filter(Log.project_id == project_id, Log.level == level.lower())
-            .order_by(Log.created_at.desc())
-            .all()
+        # Vérifier l'accès au projet dans la même requête
+        return await _fetch_owned_page(
+            _PAGES_LOGS_BY_LEVEL,
+            {"level": level_member},
+            project_id,
+            user_id,
+            limit,
+            cursor,
+            db,
         )
 
-        return Ok(logs)
-
     except Exception as e:
         return Err(
             HTTPException(
@@ -212,24 +377,26 @@ def get_logs_by_level(
         )
 
 
-def get_logs_by_category(
-    project_id: str, category: str, user_id: str, db: Session
+async def get_logs_by_category(
+    project_id: uuid.UUID,
+    category: str,
+    user_id: uuid.UUID,
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
 ) -> Result[List[Log], HTTPException]:
     try:
-        # Vérifier si l'utilisateur a accès au projet
-        project_result = check_project_ownership(project_id, user_id, db)
-        if project_result.is_err():
-            return Err(project_result.unwrap_err())
-
-        logs = (
-            db.query(Log)
-            .filter(Log.project_id == project_id, Log.category == category)
-            .order_by(Log.created_at.desc())
-            .all()
+        # Vérifier l'accès au projet dans la même requête
+        return await _fetch_owned_page(
+            _PAGES_LOGS_BY_CATEGORY,
+            {"category": category},
+            project_id,
+            user_id,
+            limit,
+            cursor,
+            db,
         )
 
-        return Ok(logs)
-
     except Exception as e:
         return Err(
             HTTPException(
@@ -239,27 +406,26 @@ def get_logs_by_category(
         )
 
 
-def get_logs_by_tag(
-    project_id: str, tag: str, user_id: str, db: Session
+async def get_logs_by_tag(
+    project_id: uuid.UUID,
+    tag: str,
+    user_id: uuid.UUID,
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
 ) -> Result[List[Log], HTTPException]:
     try:
-        # Vérifier si l'utilisateur a accès au projet
-        project_result = check_project_ownership(project_id, user_id, db)
-        if project_result.is_err():
-            return Err(project_result.unwrap_err())
-
-        from sqlalchemy import or_
-
-        logs = (
-            db.query(Log)
-            .filter(Log.project_id == project_id)
-            .filter(Log.tags.op("?")(tag))
-            .order_by(Log.created_at.desc())
-            .all()
+        # Vérifier l'accès au projet dans la même requête
+        return await _fetch_owned_page(
+            _PAGES_LOGS_BY_TAG,
+            {"tags": [tag]},
+            project_id,
+            user_id,
+            limit,
+            cursor,
+            db,
         )
 
-        return Ok(logs)
-
     except Exception as e:
         return Err(
             HTTPException(
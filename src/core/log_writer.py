@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from src.models.base import SessionLocal
+from src.models.log import Log
+
+logger = logging.getLogger(__name__)
+
+# Un lot est écrit dès qu'il atteint BATCH_SIZE lignes ou que FLUSH_INTERVAL
+# secondes se sont écoulées depuis la première ligne en attente
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.05
+# Au-delà, l'ingestion refuse les logs plutôt que de saturer la mémoire
+MAX_PENDING_LOGS = 50_000
+# Délai avant de réessayer un lot quand la base est injoignable, doublé à
+# chaque échec jusqu'à MAX_RETRY_DELAY secondes
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 30
+
+_STMT_INSERT_LOGS = insert(Log)
+
+_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=MAX_PENDING_LOGS)
+
+
+def enqueue_log(row: dict) -> bool:
+    """Met un log en attente d'écriture ; renvoie False si le tampon est plein
+
+    asyncio.Queue n'est pas thread-safe : à appeler depuis la boucle
+    d'événements, donc depuis une route `async def`.
+    """
+    try:
+        _queue.put_nowait(row)
+    except asyncio.QueueFull:
+        return False
+    return True
+
+
+async def _insert_rows(rows: list[dict]) -> None:
+    """Insère des logs en une seule requête et un seul commit"""
+    async with SessionLocal() as db:
+        await db.execute(_STMT_INSERT_LOGS, rows)
+        await db.commit()
+
+
+async def _write_batch(rows: list[dict]) -> None:
+    """Écrit un lot de logs déjà acceptés (201) par l'API
+
+    Une ligne invalide (projet supprimé entre-temps, valeur refusée) fait
+    échouer tout l'INSERT : le lot est alors coupé en deux jusqu'à isoler
+    les lignes fautives, seules abandonnées. Les autres erreurs (base
+    injoignable) remontent à l'appelant, qui réessaie le lot.
+    """
+    try:
+        await _insert_rows(rows)
+    except (IntegrityError, DataError):
+        # Un lot réessayé après une coupure peut contenir des lignes déjà
+        # écrites : leur id, fixé à l'ingestion, les fait rejeter ici
+        # au lieu de les écrire deux fois
+        if len(rows) == 1:
+            logger.exception(
+                "Dropping buffered log %s of project %s", rows[0]["id"], rows[0]["project_id"]
+            )
+            return
+        middle = len(rows) // 2
+        await _write_batch(rows[:middle])
+        await _write_batch(rows[middle:])
+
+
+async def run_log_writer() -> None:
+    """Tâche de fond : vide la file d'attente des logs par lots"""
+    loop = asyncio.get_running_loop()
+    batch: list[dict] = []
+    writing: asyncio.Task | None = None
+    try:
+        while True:
+            batch.append(await _queue.get())
+            deadline = loop.time() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Le lot reste dans `batch` jusqu'à ce qu'il soit écrit. Tant que la
+            # base est injoignable, la file n'est plus vidée : elle se remplit
+            # et enqueue_log refuse les nouveaux logs (503) au lieu de les perdre
+            delay = RETRY_DELAY
+            while True:
+                # Protégée de l'annulation : un arrêt pendant l'écriture l'attend
+                writing = asyncio.ensure_future(_write_batch(batch))
+                try:
+                    await asyncio.shield(writing)
+                    break
+                except Exception:
+                    logger.exception(
+                        "Failed to write %d buffered logs, retrying in %.1fs", len(batch), delay
+                    )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
+            writing = None
+            batch = []
+    finally:
+        # À l'arrêt : finir l'écriture en cours, puis écrire le lot en cours
+        # et tout ce qui reste en attente, en une seule tentative par lot
+        if writing is not None:
+            await asyncio.wait([writing])
+            if not writing.cancelled() and writing.exception() is None:
+                batch = []
+        while not _queue.empty():
+            batch.append(_queue.get_nowait())
+        for start in range(0, len(batch), BATCH_SIZE):
+            rows = batch[start:start + BATCH_SIZE]
+            try:
+                await _write_batch(rows)
+            except Exception:
+                logger.exception("Dropping %d buffered logs: database unreachable at shutdown", len(rows))
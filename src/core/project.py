@@ -1,217 +1,265 @@
+import logging
+import uuid
 from collections.abc import Sequence
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, delete, select, tuple_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 from typing import List, Optional
 from src.models.base import get_db
 from src.models.project import Project
 from src.models.user import User
+from src.core.api_key import evict_project_keys
+from src.core.auth import get_current_user
 from src.utils.result import Result, Ok, Err
-from fastapi import HTTPException, status
-
-
-def create_project(
-    project_data: dict, db: Session, owner: User
+from src.utils.cursor import Cursor
+from fastapi import Depends, HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+# (status, détail) des erreurs renvoyées : une HTTPException neuve est créée
+# à chaque erreur, une instance partagée accumulerait les tracebacks des raise
+_ERR_NAME_TAKEN = (status.HTTP_400_BAD_REQUEST, "Project name already exists for this user")
+_ERR_NOT_FOUND = (status.HTTP_404_NOT_FOUND, "Project not found or access denied")
+_ERR_DB = (status.HTTP_500_INTERNAL_SERVER_ERROR, "Database error occurred")
+_ERR_CREATE = (status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to create project")
+_ERR_UPDATE = (status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to update project")
+_ERR_DELETE = (status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to delete project")
+
+# Une liste de projets ne sérialise aucune relation : raiseload("*") fait
+# échouer tout chargement paresseux au lieu d'émettre une requête par projet.
+# Pagination par clé (created_at, id), dans l'ordre de ix_projects_owner_id_created_at
+_STMT_PROJECTS_BY_OWNER = (
+    select(Project)
+    .where(Project.owner_id == bindparam("owner_id"))
+    .order_by(Project.created_at.desc(), Project.id.desc())
+    .options(raiseload("*"))
+    .limit(bindparam("limit"))
+)
+_STMT_PROJECTS_BY_OWNER_AFTER = _STMT_PROJECTS_BY_OWNER.where(
+    tuple_(Project.created_at, Project.id)
+    < tuple_(
+        bindparam("cursor_created_at", type_=Project.created_at.type),
+        bindparam("cursor_id", type_=Project.id.type),
+    )
+)
+# Avec la clé active de chaque projet : une seule requête IN pour toute la page
+_STMT_PROJECTS_WITH_API_KEY = _STMT_PROJECTS_BY_OWNER.options(
+    selectinload(Project.active_api_key)
+)
+_STMT_PROJECTS_WITH_API_KEY_AFTER = _STMT_PROJECTS_BY_OWNER_AFTER.options(
+    selectinload(Project.active_api_key)
+)
+# Lecture d'un projet de l'utilisateur, une variante par combinaison
+# (verrou FOR UPDATE, chargement de la clé active)
+_STMT_PROJECT_BY_ID_OWNER = (
+    select(Project)
+    .where(Project.id == bindparam("project_id"), Project.owner_id == bindparam("user_id"))
+    .limit(1)
+)
+
+
+def _user_project_stmt(for_update: bool, load_api_key: bool):
+    stmt = _STMT_PROJECT_BY_ID_OWNER
+    if for_update:
+        stmt = stmt.with_for_update()
+    if load_api_key:
+        # Charger la clé active dans la même requête (LEFT OUTER JOIN)
+        stmt = stmt.options(joinedload(Project.active_api_key))
+    return stmt
+
+
+_STMTS_USER_PROJECT = {
+    (for_update, load_api_key): _user_project_stmt(for_update, load_api_key)
+    for for_update in (False, True)
+    for load_api_key in (False, True)
+}
+
+_STMT_PROJECT_NAME_TAKEN = (
+    select(Project.id)
+    .where(Project.name == bindparam("name"), Project.owner_id == bindparam("user_id"))
+    .limit(1)
+)
+_STMT_PROJECT_NAME_TAKEN_BY_OTHER = _STMT_PROJECT_NAME_TAKEN.where(
+    Project.id != bindparam("exclude_id")
+)
+# Vérifie l'ownership dans le DELETE lui-même ; logs et clés partent par ON DELETE CASCADE
+_STMT_DELETE_PROJECT = (
+    delete(Project)
+    .where(Project.id == bindparam("project_id"), Project.owner_id == bindparam("user_id"))
+    .returning(Project.id)
+    .execution_options(synchronize_session=False)
+)
+
+
+async def create_project(
+    project_data: dict, db: AsyncSession, owner: User
 ) -> Result[Project, HTTPException]:
-    try:
-        if not is_project_name_available(project_data["name"], str(owner.id), db):
-            return Err(
-                HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Project name already exists for this user",
-                )
-            )
-
-        new_project = Project(name=project_data["name"], owner_id=owner.id)
-
-        db.add(new_project)
-        db.commit()
-        db.refresh(new_project)
-
-        return Ok(new_project)
-
-    except Exception as e:
-        return Err(
-            HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create project",
-            )
-        )
+    new_project = Project(name=project_data["name"], owner_id=owner.id)
 
-
-def get_projects_by_user(
-    user_id: str, db: Session
+    # L'unicité du nom par utilisateur est garantie par uq_project_owner_name :
+    # une seule requête, et pas de course entre vérification et insertion
+    db.add(new_project)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return Err(HTTPException(*_ERR_NAME_TAKEN))
+    except SQLAlchemyError:
+        logger.exception("Failed to create project")
+        await db.rollback()
+        return Err(HTTPException(*_ERR_CREATE))
+
+    return Ok(new_project)
+
+
+async def get_projects_by_user(
+    user_id: uuid.UUID,
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: Optional[Cursor] = None,
+    *,
+    load_api_key: bool = False,
 ) -> Result[Sequence[Project], HTTPException]:
     try:
-        projects = (
-            db.query(Project)
-            .filter(Project.owner_id == user_id)
-            .order_by(Project.created_at.desc())
-            .all()
-        )
+        params = {"owner_id": user_id, "limit": limit}
+        if cursor is None:
+            stmt = _STMT_PROJECTS_WITH_API_KEY if load_api_key else _STMT_PROJECTS_BY_OWNER
+        else:
+            stmt = _STMT_PROJECTS_WITH_API_KEY_AFTER if load_api_key else _STMT_PROJECTS_BY_OWNER_AFTER
+            params["cursor_created_at"], params["cursor_id"] = cursor
+        projects = (await db.scalars(stmt, params)).all()
 
         return Ok(projects)
 
-    except Exception as e:
-        return Err(
-            HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database error occurred",
-            )
-        )
+    except SQLAlchemyError:
+        logger.exception("Failed to list projects")
+        return Err(HTTPException(*_ERR_DB))
 
 
-def get_user_project(
-    project_id: str, user_id: str, db: Session
+async def get_user_project(
+    project_id: uuid.UUID,
+    user_id: uuid.UUID,
+    db: AsyncSession,
+    *,
+    for_update: bool = False,
+    load_api_key: bool = False,
 ) -> Result[Project, HTTPException]:
     try:
-        project = (
-            db.query(Project)
-            .filter(Project.id == project_id, Project.owner_id == user_id)
-            .first()
+        project = await db.scalar(
+            _STMTS_USER_PROJECT[for_update, load_api_key],
+            {"project_id": project_id, "user_id": user_id},
         )
 
         if project is None:
-            return Err(
-                HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Project not found or access denied",
-                )
-            )
+            return Err(HTTPException(*_ERR_NOT_FOUND))
 
         return Ok(project)
 
-    except Exception as e:
-        return Err(
-            HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database error occurred",
-            )
-        )
-
-
-def update_project(
-    project_id: str, project_data: dict, user_id: str, db: Session
+    except SQLAlchemyError:
+        logger.exception("Failed to load project")
+        return Err(HTTPException(*_ERR_DB))
+
+
+async def get_owned_project(
+    project_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Project:
+    """Dépendance : le projet du chemin, s'il appartient à l'utilisateur (sinon 404)"""
+    result = await get_user_project(project_id, current_user.id, db)
+    if not result.ok:
+        raise result.unwrap_err()
+    return result.value
+
+
+async def get_owned_project_with_api_key(
+    project_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Project:
+    """Comme get_owned_project, avec la clé active chargée dans la même requête"""
+    result = await get_user_project(project_id, current_user.id, db, load_api_key=True)
+    if not result.ok:
+        raise result.unwrap_err()
+    return result.value
+
+
+async def update_project(
+    project_id: uuid.UUID, project_data: dict, user_id: uuid.UUID, db: AsyncSession
 ) -> Result[Project, HTTPException]:
     """Mettre à jour un projet avec vérification ownership"""
     try:
-        # Vérifier si l'utilisateur est propriétaire du projet
-        ownership_check = check_project_ownership(project_id, user_id, db)
-        if ownership_check.is_err():
-            return Err(ownership_check.unwrap_err())
+        # Récupérer le projet (vérifie aussi l'ownership), verrouillé jusqu'au commit
+        project_result = await get_user_project(project_id, user_id, db, for_update=True)
+        if not project_result.ok:
+            return Err(project_result.unwrap_err())
+
+        project = project_result.value
 
         # Vérifier si le nouveau nom est disponible (si un nouveau nom est fourni)
-        if (
-            "name" in project_data
-            and project_data["name"] != ownership_check.unwrap().name
-        ):
-            if not is_project_name_available(
+        if "name" in project_data and project_data["name"] != project.name:
+            if not await is_project_name_available(
                 project_data["name"], user_id, db, exclude_id=project_id
             ):
-                return Err(
-                    HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Project name already exists for this user",
-                    )
-                )
-
-        # Récupérer le projet à mettre à jour
-        project_result = get_user_project(project_id, user_id, db)
-        if project_result.is_err():
-            return Err(project_result.unwrap_err())
-
-        project = project_result.unwrap()
+                return Err(HTTPException(*_ERR_NAME_TAKEN))
 
         # Mettre à jour les champs
         if "name" in project_data:
             project.name = project_data["name"]
 
-        db.commit()
-        db.refresh(project)
-
+        await db.commit()
         return Ok(project)
 
-    except Exception as e:
-        return Err(
-            HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update project",
-            )
-        )
+    except IntegrityError:
+        # Un autre projet a pris ce nom entre la vérification et le commit
+        await db.rollback()
+        return Err(HTTPException(*_ERR_NAME_TAKEN))
+    except SQLAlchemyError:
+        logger.exception("Failed to update project %s", project_id)
+        await db.rollback()
+        return Err(HTTPException(*_ERR_UPDATE))
 
 
-def delete_project(
-    project_id: str, user_id: str, db: Session
+async def delete_project(
+    project_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession
 ) -> Result[bool, HTTPException]:
     """Supprimer un projet avec vérification ownership"""
     try:
-        # Vérifier si l'utilisateur est propriétaire du projet
-        ownership_check = check_project_ownership(project_id, user_id, db)
-        if ownership_check.is_err():
-            return Err(ownership_check.unwrap_err())
-
-        # Récupérer le projet à supprimer
-        project_result = get_user_project(project_id, user_id, db)
-        if project_result.is_err():
-            return Err(project_result.unwrap_err())
-
-        project = project_result.unwrap()
-
-        # Supprimer le projet
-        db.delete(project)
-        db.commit()
-
-        return Ok(True)
-
-    except Exception as e:
-        return Err(
-            HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete project",
-            )
+        # Supprimer le projet en une seule requête
+        deleted_id = await db.scalar(
+            _STMT_DELETE_PROJECT, {"project_id": project_id, "user_id": user_id}
         )
+        await db.commit()
 
+        if deleted_id is None:
+            return Err(HTTPException(*_ERR_NOT_FOUND))
 
-def check_project_ownership(
-    project_id: str, user_id: str, db: Session
-) -> Result[bool, HTTPException]:
-    try:
-        project = (
-            db.query(Project)
-            .filter(Project.id == project_id, Project.owner_id == user_id)
-            .first()
-        )
-
-        if project is None:
-            return Err(
-                HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Project not found or access denied",
-                )
-            )
+        # Les clés du projet n'existent plus : ne plus les accepter depuis le cache
+        evict_project_keys(deleted_id)
 
         return Ok(True)
 
-    except Exception as e:
-        return Err(
-            HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database error occurred",
-            )
-        )
+    except SQLAlchemyError:
+        logger.exception("Failed to delete project %s", project_id)
+        await db.rollback()
+        return Err(HTTPException(*_ERR_DELETE))
 
 
-def is_project_name_available(
-    name: str, user_id: str, db: Session, exclude_id: Optional[str] = None
+async def is_project_name_available(
+    name: str, user_id: uuid.UUID, db: AsyncSession, exclude_id: Optional[uuid.UUID] = None
 ) -> bool:
     try:
-        query = db.query(Project).filter(
-            Project.name == name, Project.owner_id == user_id
-        )
-
+        params = {"name": name, "user_id": user_id}
         if exclude_id:
-            query = query.filter(Project.id != exclude_id)
+            stmt = _STMT_PROJECT_NAME_TAKEN_BY_OTHER
+            params["exclude_id"] = exclude_id
+        else:
+            stmt = _STMT_PROJECT_NAME_TAKEN
 
-        existing_project = query.first()
+        existing_project = await db.scalar(stmt, params)
         return existing_project is None
 
-    except Exception:
+    except SQLAlchemyError:
+        logger.exception("Failed to check project name availability")
         return False
@@ -1,13 +1,44 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
-from src.models.base import create_tables
+from fastapi.responses import ORJSONResponse
+from src.core.api_key import run_usage_flusher
+from src.core.log_writer import run_log_writer
+from src.models.base import create_tables, engine
 from src.routers import auth, project, log, api_key
 
-# Créer les tables au démarrage
-create_tables()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Créer les tables au démarrage
+    await create_tables()
+    logger.info("Database pool: %s", engine.pool.status())
+    # Écrire les logs reçus par lots en arrière-plan
+    # et la dernière utilisation des clés API périodiquement
+    background_tasks = [
+        asyncio.create_task(run_log_writer()),
+        asyncio.create_task(run_usage_flusher()),
+    ]
+    yield
+    # Arrêter les tâches : chacune écrit ce qui reste en attente avant de rendre la main
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    # Fermer les connexions du pool à l'arrêt
+    await engine.dispose()
+
 
 app = FastAPI(
     title="Loggy",
-    version="0.0.1"
+    version="0.0.1",
+    lifespan=lifespan,
+    # orjson sérialise UUID et datetime nativement, en C
+    default_response_class=ORJSONResponse,
 )
 
 app.include_router(auth.router)
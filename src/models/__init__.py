@@ -0,0 +1,6 @@
+# Importer tous les modèles pour que les relations par nom ("APIKey", "Log"...)
+# soient résolues même si un module n'importe qu'un seul modèle
+from src.models.user import User
+from src.models.project import Project
+from src.models.log import Log
+from src.models.api_key import APIKey
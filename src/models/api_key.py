@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, func, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, func, Boolean, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -6,10 +6,25 @@ from .base import Base
 
 class APIKey(Base):
     __tablename__ = "api_keys"
+    __table_args__ = (
+        # Authentication filters on both columns, so a single index probe answers it
+        Index("ix_apikey_hash_active", "key_hash", "is_active"),
+        # A project's current key: only active rows are indexed, so the index
+        # stays small however many rotated keys accumulate. Unique, so two
+        # concurrent rotations cannot both leave an active key behind
+        Index(
+            "ix_api_keys_project_active",
+            "project_id",
+            unique=True,
+            postgresql_where=text("is_active = true"),
+        ),
+    )
+    # Load created_at from the INSERT's RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     key_hash = Column(String(255), unique=True, nullable=False, index=True)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     last_used_at = Column(DateTime(timezone=True))
 
@@ -1,11 +1,11 @@
-from sqlalchemy import Column, String, DateTime, func, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy import Column, String, DateTime, func, ForeignKey, Text, Index, desc
+from sqlalchemy.dialects.postgresql import ARRAY, ENUM, UUID
 from sqlalchemy.orm import relationship
 import uuid
 from enum import Enum as PyEnum
 from src.models.base import Base
 
-class LogLevel(PyEnum):
+class LogLevel(str, PyEnum):
     INFO = "info"
     DEBUG = "debug"
     WARNING = "warning"
@@ -14,10 +14,22 @@ class LogLevel(PyEnum):
 
 class Log(Base):
     __tablename__ = "logs"
+    __table_args__ = (
+        # Matches the (created_at, id) keyset ordering of the per-project log lists
+        Index("ix_logs_project_created_at", "project_id", desc("created_at"), desc("id")),
+        # Lets `tags @> ARRAY[...]` use an index instead of scanning the project's logs
+        Index("ix_logs_tags_gin", "tags", postgresql_using="gin"),
+    )
+    # Load created_at / updated_at from the INSERT's or UPDATE's RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
-    level = Column(String(50), nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    # PostgreSQL ENUM storing the lowercase values ("info", "error"...)
+    level = Column(
+        ENUM(LogLevel, name="loglevel", values_callable=lambda levels: [level.value for level in levels]),
+        nullable=False,
+    )
     category = Column(String(255), nullable=True)
     message = Column(Text, nullable=False)
     tags = Column(ARRAY(String), nullable=True)
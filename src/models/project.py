@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, func, ForeignKey
+from sqlalchemy import Column, String, DateTime, func, ForeignKey, Index, UniqueConstraint, desc
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -6,6 +6,14 @@ from src.models.base import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Project names are unique per owner
+        UniqueConstraint("owner_id", "name", name="uq_project_owner_name"),
+        # Matches the (created_at, id) keyset ordering of an owner's project list
+        Index("ix_projects_owner_id_created_at", "owner_id", desc("created_at"), desc("id")),
+    )
+    # Load created_at / updated_at from the INSERT/UPDATE's RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -17,5 +25,14 @@ class Project(Base):
 
     # Relationships
     owner = relationship("User", back_populates="projects")
-    logs = relationship("Log", back_populates="project", cascade="all, delete-orphan")
-    api_key = relationship("APIKey", back_populates="project", uselist=False)
\ No newline at end of file
+    # Deleting a project deletes its logs and keys through ON DELETE CASCADE
+    logs = relationship("Log", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    api_key = relationship("APIKey", back_populates="project", uselist=False, passive_deletes=True)
+    # The project's current key; loaded only on request with joinedload()
+    active_api_key = relationship(
+        "APIKey",
+        primaryjoin="and_(Project.id == APIKey.project_id, APIKey.is_active == True)",
+        uselist=False,
+        viewonly=True,
+        lazy="raise",
+    )
\ No newline at end of file
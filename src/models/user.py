@@ -6,6 +6,8 @@ from .base import Base
 
 class User(Base):
     __tablename__ = "users"
+    # Load created_at from the INSERT's RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, nullable=False)
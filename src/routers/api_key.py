@@ -1,23 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from src.core.auth import get_current_user
-from src.core.project import check_project_ownership
-from src.core.api_key import get_api_key_by_project, create_api_key, reset_api_key
+from src.core.project import get_owned_project, get_owned_project_with_api_key, get_projects_by_user
+from src.core.api_key import create_api_key, reset_api_key
+from src.utils.api_key import generate_api_key
 from src.models.user import User
+from src.models.api_key import APIKey
+from src.models.project import Project
 from src.models.base import get_db
-from sqlalchemy.orm import Session
-from uuid import uuid4
+from src.routers.pagination import pagination, set_next_cursor
+from src.routers.responses import TrustedResponse
+from src.utils.cursor import Cursor
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID, uuid4
 
 router = APIRouter(prefix="/api-keys", tags=["api-keys"])
+get_pagination = pagination(default_limit=50)
 
 
-class APIKeyResponse(BaseModel):
-    id: str
-    key: str
-    project_id: str
+class APIKeyResponse(TrustedResponse):
+    id: UUID
+    key: Optional[str] = None
+    project_id: UUID
     active: bool
     created_at: datetime
     last_used: Optional[datetime] = None
@@ -25,62 +33,98 @@ class APIKeyResponse(BaseModel):
     @classmethod
     def from_dummy(cls, project_id: str):
         return cls(
-            id=str(uuid4()),
-            key="sk_live_" + "".join([str(i) for i in range(32)]),
+            id=uuid4(),
+            key=generate_api_key(),
             project_id=project_id,
             active=True,
             created_at=datetime.now(),
             last_used=None
         )
 
+    @classmethod
+    def from_orm(cls, api_key: APIKey):
+        return cls.from_trusted(
+            id=api_key.id,
+            project_id=api_key.project_id,
+            active=api_key.is_active,
+            created_at=api_key.created_at,
+            last_used=api_key.last_used_at
+        )
+
+
+class ProjectWithAPIKeyResponse(BaseModel):
+    project_id: UUID
+    name: str
+    api_key: Optional[APIKeyResponse] = None
+
 
 class APIKeyResetResponse(BaseModel):
     new_key: str
     message: str
 
 
-
-
-@router.get("/projects/{project_id}", response_model=APIKeyResponse)
-async def get_api_key(
-    project_id: str,
+def _api_key_payload(api_key: APIKey) -> dict:
+    """Plain dict with APIKeyResponse's fields, serialized by orjson as is."""
+    return {
+        "id": api_key.id,
+        "key": None,
+        "project_id": api_key.project_id,
+        "active": api_key.is_active,
+        "created_at": api_key.created_at,
+        "last_used": api_key.last_used_at,
+    }
+
+
+# Pas de validation par response_model : la liste part directement en orjson
+@router.get("/projects", response_model=None, responses={200: {"model": List[ProjectWithAPIKeyResponse]}})
+async def list_project_api_keys(
+    page: tuple[int, Optional[Cursor]] = Depends(get_pagination),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    # Vérifier que l'utilisateur est propriétaire du projet
-    ownership_check = check_project_ownership(project_id, str(current_user.id), db)
-    if ownership_check.is_err():
-        raise ownership_check.unwrap_err()
+    # Les clés actives de toute la page arrivent en une seule requête supplémentaire
+    limit, cursor = page
+    result = await get_projects_by_user(
+        current_user.id, db, limit, cursor, load_api_key=True
+    )
+    if not result.ok:
+        raise result.unwrap_err()
+
+    projects = result.value
+    response = ORJSONResponse(
+        [
+            {
+                "project_id": project.id,
+                "name": project.name,
+                "api_key": _api_key_payload(project.active_api_key) if project.active_api_key else None,
+            }
+            for project in projects
+        ]
+    )
+    set_next_cursor(response, projects, limit)
+    return response
+
 
-    api_key_obj = get_api_key_by_project(project_id, db)
+@router.get("/projects/{project_id}", response_model=APIKeyResponse)
+async def get_api_key(project: Project = Depends(get_owned_project_with_api_key)):
+    api_key_obj = project.active_api_key
     if not api_key_obj:
         raise HTTPException(status_code=404, detail="API Key not found")
 
-    return APIKeyResponse(
-        id=str(api_key_obj.id),
-        project_id=str(api_key_obj.project_id),
-        active=api_key_obj.is_active,
-        created_at=api_key_obj.created_at,
-        last_used=api_key_obj.last_used_at
-    )
+    return APIKeyResponse.from_orm(api_key_obj)
 
 
 @router.post("/projects/{project_id}/generate", response_model=APIKeyResponse, status_code=status.HTTP_201_CREATED)
 async def generate_api_key_route(
-    project_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    project_id: UUID,
+    project: Project = Depends(get_owned_project),
+    db: AsyncSession = Depends(get_db),
 ):
-    # Vérifier que l'utilisateur est propriétaire du projet
-    ownership_check = check_project_ownership(project_id, str(current_user.id), db)
-    if ownership_check.is_err():
-        raise ownership_check.unwrap_err()
-
-    api_key_obj, key = create_api_key(project_id, db)
+    api_key_obj, key = await create_api_key(project_id, db)
     return APIKeyResponse(
-        id=str(api_key_obj.id),
+        id=api_key_obj.id,
         key=key,
-        project_id=str(api_key_obj.project_id),
+        project_id=api_key_obj.project_id,
         active=api_key_obj.is_active,
         created_at=api_key_obj.created_at,
         last_used=api_key_obj.last_used_at
@@ -89,16 +133,11 @@ async def generate_api_key_route(
 
 @router.post("/projects/{project_id}/reset", response_model=APIKeyResetResponse)
 async def reset_api_key_route(
-    project_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    project_id: UUID,
+    project: Project = Depends(get_owned_project),
+    db: AsyncSession = Depends(get_db),
 ):
-    # Vérifier que l'utilisateur est propriétaire du projet
-    ownership_check = check_project_ownership(project_id, str(current_user.id), db)
-    if ownership_check.is_err():
-        raise ownership_check.unwrap_err()
-
-    api_key_obj = reset_api_key(project_id, db)
+    await reset_api_key(project_id, db)
     return APIKeyResetResponse(
         new_key="***",  # We don't return the actual key for security
         message="API key has been reset successfully"
@@ -107,23 +146,17 @@ async def reset_api_key_route(
 
 @router.get("/projects/{project_id}/status")
 async def get_api_key_status(
-    project_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    project_id: UUID, project: Project = Depends(get_owned_project_with_api_key)
 ):
-    # Vérifier que l'utilisateur est propriétaire du projet
-    ownership_check = check_project_ownership(project_id, str(current_user.id), db)
-    if ownership_check.is_err():
-        raise ownership_check.unwrap_err()
-
-    api_key_obj = get_api_key_by_project(project_id, db)
+    api_key_obj = project.active_api_key
     if not api_key_obj:
         raise HTTPException(status_code=404, detail="API Key not found")
 
-    return {
+    # Dictionnaire déjà sérialisable par orjson : pas de passage par jsonable_encoder
+    return ORJSONResponse({
         "project_id": project_id,
         "active": api_key_obj.is_active,
         "created_at": api_key_obj.created_at,
         "last_used": api_key_obj.last_used_at,
         "can_reset": True
-    }
\ No newline at end of file
+    })
\ No newline at end of file
@@ -44,24 +44,24 @@ class PasswordChangeRequest(BaseModel):
 
 @router.post("/signup", response_model=UserResponse)
 async def signup(user: UserCreate, db=Depends(get_db)):
-    new_user = create_user(user.email, user.password, user.username, db)
+    new_user = await create_user(user.email, user.password, user.username, db)
 
-    if new_user.is_err():
-        error = new_user.unwrap()
+    if not new_user.ok:
+        error = new_user.unwrap_err()
 
         if isinstance(error, HTTPException):
             raise error
 
         raise HTTPException(status_code=500, detail="Internal server error")
 
-    result = new_user.unwrap()
+    result = new_user.value
 
     return {"id": str(result.id), "username": result.display_name, "email": result.email}
 
 
 @router.post("/login", response_model=LoginResponse)
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), db=Depends(get_db)):
-    user = authenticate_user(form_data.username, form_data.password, db)
+    user = await authenticate_user(form_data.username, form_data.password, db)
 
     if user.is_nothing():
         raise HTTPException(status_code=401, detail="Invalid credentials")
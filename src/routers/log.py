@@ -1,17 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import APIKeyHeader
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+from uuid import UUID
 
 from src.core.auth import get_current_user
-from src.core.project import check_project_ownership
-from src.core.api_key import get_api_key_by_key
+from src.core.api_key import CachedAPIKey, get_api_key_dep
 from src.models.user import User
 from src.models.log import Log
-from src.models.api_key import APIKey
 from src.core.log import (
     create_log,
+    create_logs_bulk,
     get_logs_by_project,
     get_log_by_id,
     update_log,
@@ -21,10 +23,13 @@ from src.core.log import (
     get_logs_by_tag
 )
 from src.models.base import get_db
-from sqlalchemy.orm import Session
+from src.routers.pagination import pagination, set_next_cursor
+from src.routers.responses import TrustedResponse, column_payload
+from src.utils.cursor import Cursor
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/projects", tags=["logs"])
-api_key_scheme = APIKeyHeader(name="X-API-Key")
+get_pagination = pagination(default_limit=100)
 
 
 class LogCreate(BaseModel):
@@ -34,9 +39,56 @@ class LogCreate(BaseModel):
     tags: Optional[List[str]] = []
 
 
-class LogResponse(BaseModel):
-    id: str
-    project_id: str
+class LogCreateStruct(msgspec.Struct, kw_only=True):
+    """Same fields as LogCreate, decoded by msgspec on the ingestion routes."""
+    level: str = "info"
+    category: Optional[str] = None
+    message: str
+    tags: Optional[List[str]] = []
+
+
+_LOG_DECODER = msgspec.json.Decoder(LogCreateStruct)
+_LOGS_DECODER = msgspec.json.Decoder(List[LogCreateStruct])
+
+# The ingestion routes read their body through the dependencies below, so
+# FastAPI no longer derives it: the documented schema stays LogCreate
+_LOG_CREATE_SCHEMA = LogCreate.model_json_schema()
+_LOG_CREATE_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _LOG_CREATE_SCHEMA}},
+    }
+}
+_LOGS_CREATE_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": {"type": "array", "items": _LOG_CREATE_SCHEMA}}},
+    }
+}
+
+
+def _decode_body(decoder: msgspec.json.Decoder, body: bytes):
+    """Decode and validate a JSON body in one pass, then hand plain dicts to core."""
+    try:
+        return msgspec.to_builtins(decoder.decode(body))
+    except msgspec.DecodeError as e:
+        # Same 422 shape as FastAPI's own body validation
+        raise RequestValidationError([{"type": "value_error", "loc": ("body",), "msg": str(e)}])
+
+
+async def log_create_body(request: Request) -> dict:
+    """Body of the single-log ingestion routes."""
+    return _decode_body(_LOG_DECODER, await request.body())
+
+
+async def logs_create_body(request: Request) -> List[dict]:
+    """Body of the bulk ingestion route."""
+    return _decode_body(_LOGS_DECODER, await request.body())
+
+
+class LogResponse(TrustedResponse):
+    id: UUID
+    project_id: UUID
     level: str
     category: Optional[str]
     message: str
@@ -46,9 +98,9 @@ class LogResponse(BaseModel):
 
     @classmethod
     def from_orm(cls, log: Log):
-        return cls(
-            id=str(log.id),
-            project_id=str(log.project_id),
+        return cls.from_trusted(
+            id=log.id,
+            project_id=log.project_id,
             level=log.level,
             category=log.category,
             message=log.message,
@@ -58,6 +110,19 @@ class LogResponse(BaseModel):
         )
 
 
+# Field names read from each listed row, built once
+_LOG_FIELDS = tuple(LogResponse.model_fields)
+
+
+def _log_payload(log: Log) -> dict:
+    return column_payload(log, _LOG_FIELDS)
+
+
+# List routes skip response_model validation and return orjson directly;
+# the documented schema stays LogResponse
+_LOG_LIST_RESPONSES = {200: {"model": List[LogResponse]}}
+
+
 class LogUpdate(BaseModel):
     level: Optional[str] = None
     category: Optional[str] = None
@@ -65,140 +130,186 @@ class LogUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 
-async def get_api_key_dep(api_key: str = Depends(api_key_scheme), db: Session = Depends(get_db)) -> APIKey:
-    """Authenticate API key and return API key object."""
-    api_key_obj = get_api_key_by_key(api_key, db)
-    if not api_key_obj:
-        raise HTTPException(status_code=403, detail="Invalid API Key")
-    if not api_key_obj.is_active:
-        raise HTTPException(status_code=403, detail="API Key is not active")
-    return api_key_obj
-
-
-@router.post("/{project_id}/logs", response_model=LogResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{project_id}/logs",
+    response_model=LogResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_LOG_CREATE_BODY,
+)
 async def create_log_route(
-    project_id: str,
-    log_data: LogCreate,
-    api_key: APIKey = Depends(get_api_key_dep),
-    db: Session = Depends(get_db),
+    project_id: UUID,
+    log_data: dict = Depends(log_create_body),
+    api_key: CachedAPIKey = Depends(get_api_key_dep),
 ):
     # The API key is already validated and has proper project_id
-    if str(api_key.project_id) != project_id:
+    if api_key.project_id != project_id:
         raise HTTPException(status_code=403, detail="API Key not authorized for this project")
 
-    result = create_log(project_id, log_data.dict(), db)
-    if result.is_err():
-        raise result.unwrap()
-    return LogResponse.from_orm(result.unwrap())
+    result = create_log(project_id, log_data)
+    if not result.ok:
+        raise result.unwrap_err()
+    return LogResponse.from_orm(result.value)
 
 
-@router.post("/logs", response_model=LogResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/logs",
+    response_model=LogResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_LOG_CREATE_BODY,
+)
 async def create_log_api_key_route(
-    log_data: LogCreate,
-    api_key: APIKey = Depends(get_api_key_dep),
-    db: Session = Depends(get_db),
+    log_data: dict = Depends(log_create_body),
+    api_key: CachedAPIKey = Depends(get_api_key_dep),
 ) -> LogResponse:
     """Create log using API key project ID (SDK endpoint)."""
     # Extract project_id from validated API key
-    project_id = str(api_key.project_id)
+    project_id = api_key.project_id
 
     if not project_id:
         raise HTTPException(status_code=400, detail="API key not associated with a project")
 
     # Use existing core logic to create log
-    result = create_log(project_id, log_data.dict(), db)
-    if result.is_err():
-        raise result.unwrap()
+    result = create_log(project_id, log_data)
+    if not result.ok:
+        raise result.unwrap_err()
+
+    return LogResponse.from_orm(result.value)
+
+
+@router.post(
+    "/logs/bulk",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": List[LogResponse]}},
+    openapi_extra=_LOGS_CREATE_BODY,
+)
+async def create_logs_bulk_api_key_route(
+    logs_data: List[dict] = Depends(logs_create_body),
+    api_key: CachedAPIKey = Depends(get_api_key_dep),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create many logs in one insert using API key project ID (SDK endpoint)."""
+    result = await create_logs_bulk(api_key.project_id, logs_data, db)
+    if not result.ok:
+        raise result.unwrap_err()
 
-    return LogResponse.from_orm(result.unwrap())
+    # RETURNING rows hold exactly LogResponse's columns: tags and the other
+    # values go to orjson as read from the database, without a model per row
+    return ORJSONResponse(
+        [row._asdict() for row in result.value], status_code=status.HTTP_201_CREATED
+    )
 
 
-@router.get("/{project_id}/logs", response_model=List[LogResponse])
+@router.get("/{project_id}/logs", response_model=None, responses=_LOG_LIST_RESPONSES)
 async def get_user_logs_route(
-    project_id: str,
+    project_id: UUID,
+    page: tuple[int, Optional[Cursor]] = Depends(get_pagination),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = get_logs_by_project(project_id, str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
-    return [LogResponse.from_orm(log) for log in result.unwrap()]
+    limit, cursor = page
+    result = await get_logs_by_project(project_id, current_user.id, db, limit, cursor)
+    if not result.ok:
+        raise result.unwrap_err()
+
+    logs = result.value
+    response = ORJSONResponse([_log_payload(log) for log in logs])
+    set_next_cursor(response, logs, limit)
+    return response
 
 
 @router.get("/{project_id}/logs/{log_id}", response_model=LogResponse)
 async def get_log_route(
-    project_id: str,
-    log_id: str,
+    project_id: UUID,
+    log_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = get_log_by_id(log_id, str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
-    return LogResponse.from_orm(result.unwrap())
+    result = await get_log_by_id(log_id, current_user.id, db)
+    if not result.ok:
+        raise result.unwrap_err()
+    return LogResponse.from_orm(result.value)
 
 
 @router.put("/{project_id}/logs/{log_id}", response_model=LogResponse)
 async def update_log_route(
-    project_id: str,
-    log_id: str,
+    project_id: UUID,
+    log_id: UUID,
     log_data: LogUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = update_log(log_id, log_data.dict(exclude_unset=True), str(current_user.id), db)
-    if result.is_err():
+    result = await update_log(log_id, log_data.model_dump(exclude_unset=True), current_user.id, db)
+    if not result.ok:
         raise result.unwrap_err()
-    return LogResponse.from_orm(result.unwrap())
+    return LogResponse.from_orm(result.value)
 
 
 @router.delete("/{project_id}/logs/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_log_route(
-    project_id: str,
-    log_id: str,
+    project_id: UUID,
+    log_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = delete_log(log_id, str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
+    result = await delete_log(log_id, current_user.id, db)
+    if not result.ok:
+        raise result.unwrap_err()
     return
 
 
-@router.get("/{project_id}/logs/level/{level}", response_model=List[LogResponse])
+@router.get("/{project_id}/logs/level/{level}", response_model=None, responses=_LOG_LIST_RESPONSES)
 async def get_logs_by_level_route(
-    project_id: str,
+    project_id: UUID,
     level: str,
+    page: tuple[int, Optional[Cursor]] = Depends(get_pagination),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = get_logs_by_level(project_id, level, str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
-    return [LogResponse.from_orm(log) for log in result.unwrap()]
+    limit, cursor = page
+    result = await get_logs_by_level(project_id, level, current_user.id, db, limit, cursor)
+    if not result.ok:
+        raise result.unwrap_err()
 
+    logs = result.value
+    response = ORJSONResponse([_log_payload(log) for log in logs])
+    set_next_cursor(response, logs, limit)
+    return response
 
-@router.get("/{project_id}/logs/category/{category}", response_model=List[LogResponse])
+
+@router.get("/{project_id}/logs/category/{category}", response_model=None, responses=_LOG_LIST_RESPONSES)
 async def get_logs_by_category_route(
-    project_id: str,
+    project_id: UUID,
     category: str,
+    page: tuple[int, Optional[Cursor]] = Depends(get_pagination),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = get_logs_by_category(project_id, category, str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
-    return [LogResponse.from_orm(log) for log in result.unwrap()]
+    limit, cursor = page
+    result = await get_logs_by_category(project_id, category, current_user.id, db, limit, cursor)
+    if not result.ok:
+        raise result.unwrap_err()
+
+    logs = result.value
+    response = ORJSONResponse([_log_payload(log) for log in logs])
+    set_next_cursor(response, logs, limit)
+    return response
 
 
-@router.get("/{project_id}/logs/tag/{tag}", response_model=List[LogResponse])
+@router.get("/{project_id}/logs/tag/{tag}", response_model=None, responses=_LOG_LIST_RESPONSES)
 async def get_logs_by_tag_route(
-    project_id: str,
+    project_id: UUID,
     tag: str,
+    page: tuple[int, Optional[Cursor]] = Depends(get_pagination),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = get_logs_by_tag(project_id, tag, str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
-    return [LogResponse.from_orm(log) for log in result.unwrap()]
\ No newline at end of file
+    limit, cursor = page
+    result = await get_logs_by_tag(project_id, tag, current_user.id, db, limit, cursor)
+    if not result.ok:
+        raise result.unwrap_err()
+
+    logs = result.value
+    response = ORJSONResponse([_log_payload(log) for log in logs])
+    set_next_cursor(response, logs, limit)
+    return response
\ No newline at end of file
@@ -0,0 +1,28 @@
+from fastapi import HTTPException, Query, Response
+from typing import Callable, Optional, Sequence
+
+from src.utils.cursor import Cursor, decode_cursor, encode_cursor
+
+
+def pagination(default_limit: int) -> Callable[..., tuple[int, Optional[Cursor]]]:
+    """Build a dependency parsing keyset pagination query parameters."""
+    def get_pagination(
+        limit: int = Query(default_limit, ge=1, le=1000),
+        cursor: Optional[str] = None,
+    ) -> tuple[int, Optional[Cursor]]:
+        if cursor is None:
+            return limit, None
+
+        decoded = decode_cursor(cursor)
+        if decoded.is_nothing():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return limit, decoded.unwrap()
+
+    return get_pagination
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int) -> None:
+    """Expose the position after the last row when another page may follow."""
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
@@ -1,102 +1,117 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+from uuid import UUID
 
 from src.core.auth import get_current_user
 from src.models.user import User
 from src.core.project import (
     create_project,
     get_projects_by_user,
-    get_user_project,
+    get_owned_project,
     update_project,
     delete_project,
 )
 from src.models.base import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.project import Project
+from src.routers.pagination import pagination, set_next_cursor
+from src.routers.responses import TrustedResponse, column_payload
+from src.utils.cursor import Cursor
 
 router = APIRouter(prefix="/projects", tags=["projects"])
+get_pagination = pagination(default_limit=50)
 
 
 class ProjectCreate(BaseModel):
     name: str
 
 
-class ProjectResponse(BaseModel):
-    id: str
+class ProjectResponse(TrustedResponse):
+    id: UUID
     name: str
-    owner_id: str
+    owner_id: UUID
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     @classmethod
     def from_orm(cls, project):
-        return cls(
-            id=str(project.id),
+        return cls.from_trusted(
+            id=project.id,
             name=project.name,
-            owner_id=str(project.owner_id),
+            owner_id=project.owner_id,
             created_at=project.created_at,
             updated_at=project.updated_at
         )
 
 
+# Champs lus sur chaque projet listé, calculés une seule fois
+_PROJECT_FIELDS = tuple(ProjectResponse.model_fields)
+
+
+def _project_payload(project: Project) -> dict:
+    return column_payload(project, _PROJECT_FIELDS)
+
+
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project_route(
     project: ProjectCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = create_project({"name": project.name}, db, current_user)
-    if result.is_err():
-        raise result.unwrap()
-    return ProjectResponse.from_orm(result.unwrap())
+    result = await create_project({"name": project.name}, db, current_user)
+    if not result.ok:
+        raise result.unwrap_err()
+    return ProjectResponse.from_orm(result.value)
 
 
-@router.get("/", response_model=List[ProjectResponse])
+# Pas de validation par response_model : la liste part directement en orjson
+@router.get("/", response_model=None, responses={200: {"model": List[ProjectResponse]}})
 async def get_user_projects(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    page: tuple[int, Optional[Cursor]] = Depends(get_pagination),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = get_projects_by_user(str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
-    return [ProjectResponse.from_orm(project) for project in result.unwrap()]
+    limit, cursor = page
+    result = await get_projects_by_user(current_user.id, db, limit, cursor)
+    if not result.ok:
+        raise result.unwrap_err()
+
+    projects = result.value
+    response = ORJSONResponse([_project_payload(project) for project in projects])
+    set_next_cursor(response, projects, limit)
+    return response
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(
-    project_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    result = get_user_project(project_id, str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
-    return ProjectResponse.from_orm(result.unwrap())
+async def get_project(project: Project = Depends(get_owned_project)):
+    return ProjectResponse.from_orm(project)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project_route(
-    project_id: str,
+    project_id: UUID,
     project_update: ProjectCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = update_project(
-        project_id, {"name": project_update.name}, str(current_user.id), db
+    result = await update_project(
+        project_id, {"name": project_update.name}, current_user.id, db
     )
-    if result.is_err():
+    if not result.ok:
         raise result.unwrap_err()
-    return ProjectResponse.from_orm(result.unwrap())
+    return ProjectResponse.from_orm(result.value)
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project_route(
-    project_id: str,
+    project_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = delete_project(project_id, str(current_user.id), db)
-    if result.is_err():
-        raise result.unwrap()
+    result = await delete_project(project_id, current_user.id, db)
+    if not result.ok:
+        raise result.unwrap_err()
     return
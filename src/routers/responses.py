@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Self
+
+
+class TrustedResponse(BaseModel):
+    """Response model built from rows loaded by our own queries."""
+
+    @classmethod
+    def from_trusted(cls, **values) -> Self:
+        """Build the model without validation.
+
+        The values come from typed database columns, so validating them again
+        only costs time; FastAPI still checks the response against
+        response_model.
+        """
+        return cls.model_construct(**values)
+
+
+def column_payload(instance, fields: tuple[str, ...]) -> dict:
+    """Plain dict of the given columns, serialized by orjson as is.
+
+    List queries load every column, so the values are read straight from the
+    instance __dict__ instead of through the instrumented attributes.
+    """
+    row = instance.__dict__
+    return {field: row[field] for field in fields}
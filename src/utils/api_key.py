@@ -1,35 +1,33 @@
 import secrets
-import string
 import re
 import hashlib
 from typing import Optional
 
+KEY_PREFIX = "sk_live_"
+# Keys issued before token_urlsafe only used letters and digits: still accepted
+_KEY_FORMAT_RE = re.compile(re.escape(KEY_PREFIX) + r'[a-zA-Z0-9_-]{32}')
+
 def generate_api_key() -> str:
     """Generate a secure unique API key."""
-    prefix = "sk_live_"
-    random_part = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(32))
-    return f"{prefix}{random_part}"
+    # 24 random bytes from a single CSPRNG draw, 32 base64url characters
+    return KEY_PREFIX + secrets.token_urlsafe(24)
 
 def hash_key(key: str) -> str:
     """Hash API key for secure storage."""
-    import hashlib
     return hashlib.sha256(key.encode('utf-8')).hexdigest()
 
-def validate_key_format(key: str) -> bool:
-    """Validate API key format."""
-    pattern = r'^sk_live_[a-zA-Z0-9]{32}$'
-    return bool(re.match(pattern, key))
+def cache_key(key: str) -> bytes:
+    """Fixed-width 16-byte digest of an API key, used as an in-memory cache key."""
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
 
-def verify_key_hash(key: str, stored_hash: str) -> bool:
-    """Verify API key hash."""
-    return hashlib.sha256(key.encode('utf-8')).hexdigest() == stored_hash
+def validate_key_format(key: str) -> bool:
+    """Validate API key format: sk_live_ followed by 32 base64url characters."""
+    return _KEY_FORMAT_RE.fullmatch(key) is not None
 
 def is_api_key_valid(key: str) -> bool:
     """Basic key validation."""
     if not key or not isinstance(key, str):
         return False
 
-    if len(key) != 39:  # sk_live_ + 32 chars
-        return False
-
+    # The format check covers the length (sk_live_ + 32 chars = 40)
     return validate_key_format(key)
\ No newline at end of file
@@ -0,0 +1,24 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from src.utils.maybe import NOTHING, Maybe, Some
+
+# Keyset pagination position: (created_at, id) of the last row returned
+Cursor = tuple[datetime, uuid.UUID]
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Encode a keyset position as an opaque URL-safe string."""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Maybe[Cursor]:
+    """Decode a cursor produced by encode_cursor, or Nothing if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|")
+        return Some((datetime.fromisoformat(created_at), uuid.UUID(row_id)))
+    except (ValueError, binascii.Error):
+        return NOTHING
@@ -1,8 +1,25 @@
+import os
+
+import anyio
 import bcrypt
 
+# bcrypt keeps a core busy for the whole call: running more hashes at once
+# than there are cores only makes each of them slower
+_HASH_LIMITER = anyio.CapacityLimiter(os.cpu_count() or 1)
+
 def hash_password(password: str) -> str:
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(password.encode('utf-8'), salt)
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
\ No newline at end of file
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+async def hash_password_async(password: str) -> str:
+    """hash_password in a worker thread, so the event loop keeps serving requests."""
+    return await anyio.to_thread.run_sync(hash_password, password, limiter=_HASH_LIMITER)
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """verify_password in a worker thread, so the event loop keeps serving requests."""
+    return await anyio.to_thread.run_sync(
+        verify_password, password, hashed_password, limiter=_HASH_LIMITER
+    )
@@ -5,36 +5,44 @@ U = TypeVar("U")
 
 
 class Maybe(Generic[T]):
+    # No per-instance __dict__; the variant is a class attribute rather
+    # than an isinstance() check
+    __slots__ = ()
+    _is_some: bool
+
     def is_some(self) -> bool:
-        return isinstance(self, Some)
+        return self._is_some
 
     def is_nothing(self) -> bool:
-        return isinstance(self, Nothing)
+        return not self._is_some
 
     def unwrap(self) -> T:
-        if isinstance(self, Some):
+        if self._is_some:
             return self.value
         else:
             raise Exception("Tried to unwrap a Nothing")
 
     def map(self, f: Callable[[T], U]) -> "Maybe[U]":
-        if isinstance(self, Some):
+        if self._is_some:
             try:
                 return Some(f(self.value))
             except Exception:
-                return Nothing()
+                return NOTHING
         return self
 
     def bind(self, f: Callable[[T], "Maybe[U]"]) -> "Maybe[U]":
-        if isinstance(self, Some):
+        if self._is_some:
             try:
                 return f(self.value)
             except Exception:
-                return Nothing()
+                return NOTHING
         return self
 
 
 class Some(Maybe[T]):
+    __slots__ = ("value",)
+    _is_some = True
+
     def __init__(self, value: T):
         self.value = value
 
@@ -43,5 +51,12 @@ class Some(Maybe[T]):
 
 
 class Nothing(Maybe[T]):
+    __slots__ = ()
+    _is_some = False
+
     def __repr__(self):
         return "Nothing()"
+
+
+# Nothing carries no value: share one instance instead of allocating one per call
+NOTHING: Maybe = Nothing()
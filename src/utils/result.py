@@ -1,4 +1,5 @@
-from typing import Generic, Self, TypeVar, Callable, Protocol
+from dataclasses import dataclass
+from typing import ClassVar, Generic, Self, TypeVar, Callable, Protocol
 
 T = TypeVar("T")  # Success type
 E = TypeVar("E")  # Error type
@@ -7,17 +8,27 @@ R = TypeVar("R")  # Return type for match function
 
 
 class Result(Protocol[T, E]):
+    __slots__ = ()
+    # Tag read as a plain attribute on hot paths: `if not result.ok`
+    ok: ClassVar[bool]
+
     def is_ok(self) -> bool: ...
     def is_err(self) -> bool: ...
     def unwrap(self) -> T: ...
+    def unwrap_err(self) -> E: ...
     def map(self, f: Callable[[T], U]) -> Self: ...
     def bind(self, f: Callable[[T], Self]) -> Self: ...
+    def map_unchecked(self, f: Callable[[T], U]) -> Self: ...
+    def bind_unchecked(self, f: Callable[[T], Self]) -> Self: ...
     def match(self, on_success: Callable[[T], R], on_error: Callable[[E], R]) -> R: ...
 
 
+# The dataclasses set __match_args__ = ("value",) / ("error",), so callers can
+# also dispatch with `match result: case Ok(value): ... case Err(error): ...`
+@dataclass(slots=True, repr=False)
 class Ok(Result, Generic[T, E]):
-    def __init__(self, value: T):
-        self.value = value
+    value: T
+    ok: ClassVar[bool] = True
 
     def is_ok(self) -> bool:
         return True
@@ -28,9 +39,12 @@ class Ok(Result, Generic[T, E]):
     def unwrap(self) -> T:
         return self.value
 
+    def unwrap_err(self) -> E:
+        raise Exception("Tried to unwrap_err an Ok")
+
     def map(self, f: Callable[[T], U]) -> Self:
         try:
-            return Ok(f(self.value))
+            return self.map_unchecked(f)
         except Exception as e:
             return Err(e)
 
@@ -40,6 +54,16 @@ class Ok(Result, Generic[T, E]):
         except Exception as e:
             return Err(e)
 
+    # The unchecked variants let exceptions raised by f propagate instead of
+    # turning them into an Err: for callers that already validated their input
+    def map_unchecked(self, f: Callable[[T], U]) -> Self:
+        value = f(self.value)
+        # Unchanged value: keep this instance instead of allocating a new Ok
+        return self if value is self.value else Ok(value)
+
+    def bind_unchecked(self, f: Callable[[T], Self]) -> Self:
+        return f(self.value)
+
     def match(self, on_success: Callable[[T], R], on_error: Callable[[E], R]) -> R:
         return on_success(self.value)
 
@@ -47,9 +71,10 @@ class Ok(Result, Generic[T, E]):
         return f"Ok({self.value})"
 
 
+@dataclass(slots=True, repr=False)
 class Err(Result, Generic[T, E]):
-    def __init__(self, error: E):
-        self.error = error
+    error: E
+    ok: ClassVar[bool] = False
 
     def is_ok(self) -> bool:
         return False
@@ -60,12 +85,21 @@ class Err(Result, Generic[T, E]):
     def unwrap(self) -> T:
         raise Exception("Tried to unwrap an Err")
 
+    def unwrap_err(self) -> E:
+        return self.error
+
     def map(self, f: Callable[[T], U]) -> Self:
         return self  # propagate error
 
     def bind(self, f: Callable[[T], Self]) -> Self:
         return self  # propagate error
 
+    def map_unchecked(self, f: Callable[[T], U]) -> Self:
+        return self  # propagate error
+
+    def bind_unchecked(self, f: Callable[[T], Self]) -> Self:
+        return self  # propagate error
+
     def match(self, on_success: Callable[[T], R], on_error: Callable[[E], R]) -> R:
         return on_error(self.error)
 
@@ -73,10 +107,14 @@ class Err(Result, Generic[T, E]):
         return f"Err({self.error})"
 
 
-def match(result: Result[T, E], *, on_success: Callable[[T], R], on_error: Callable[[E], R]) -> R:
+def match(result: Result[T, E], on_success: Callable[[T], R], on_error: Callable[[E], R], /) -> R:
     """
     Functional pattern matching for Result objects.
 
+    Positional-only: `match(result, on_success, on_error)` skips keyword
+    argument handling on every dispatch. Prefer calling `result.match(...)`
+    directly: the method already knows which branch it is.
+
     Args:
         result: The Result object to match against
         on_success: Function to call for success values
@@ -0,0 +1,14 @@
+"""
+Shared pytest setup: makes the `src` package importable once for every test,
+with the settings its modules read at import time.
+"""
+
+import os
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+
+# Only needed to import the app modules: no test connects or signs tokens
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/loggy")
+os.environ.setdefault("SECRET_KEY", "test-secret")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Test script for the API key format checks.
+"""
+
+from src.utils.api_key import generate_api_key, is_api_key_valid, validate_key_format
+
+
+def test_generated_keys_are_valid():
+    """Test that freshly generated keys pass both checks."""
+    for _ in range(100):
+        key = generate_api_key()
+        assert validate_key_format(key), f"Generated key rejected: {key}"
+        assert is_api_key_valid(key), f"Generated key rejected by is_api_key_valid: {key}"
+
+
+def test_malformed_keys_are_rejected():
+    """Test that wrong prefixes, lengths and characters are rejected."""
+    valid = "sk_live_" + "a1" * 16
+    for key in (
+        "",
+        valid[:-1],
+        valid + "b",
+        "sk_test_" + valid[8:],
+        valid[:-1] + "!",
+        valid[:-1] + "é",
+        valid[:-1] + "٣",
+    ):
+        assert not validate_key_format(key), f"Malformed key accepted: {key!r}"
+        assert not is_api_key_valid(key), f"Malformed key accepted by is_api_key_valid: {key!r}"
+    assert not is_api_key_valid(None), "None accepted as a key"
+
+
+def test_alphanumeric_keys_still_valid():
+    """Test that keys issued in the older letters-and-digits format are accepted."""
+    key = "sk_live_" + "aB3" * 10 + "xY"
+    assert validate_key_format(key), f"Older key format rejected: {key}"
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the TTLCache implementation.
+"""
+
+from src.utils.cache import TTLCache
+
+
+def test_get_returns_stored_value():
+    """Test that a stored value is returned until it expires."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+    assert cache.get("key") == "value", f"Expected 'value', got {cache.get('key')}"
+    assert cache.get("missing") is None, "Expected None for a missing key"
+
+
+def test_expired_entries_are_dropped():
+    """Test that entries are no longer returned once their TTL has elapsed."""
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set("key", "value")
+    assert cache.get("key") is None, "Expected expired entry to be dropped"
+    assert len(cache) == 0, f"Expected empty cache, got {len(cache)} entries"
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the least recently used entry is evicted past maxsize."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None, "Expected 'b' to be evicted"
+    assert cache.get("a") == 1, f"Expected 1, got {cache.get('a')}"
+    assert cache.get("c") == 3, f"Expected 3, got {cache.get('c')}"
+
+
+def test_pop_invalidates_entry():
+    """Test that pop removes the entry and returns its value."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+    assert cache.pop("key") == "value", "Expected pop to return the stored value"
+    assert cache.get("key") is None, "Expected entry to be gone after pop"
+    assert cache.pop("key") is None, "Expected None when popping a missing key"
+
+
+def test_remove_where_drops_matching_values():
+    """Test that remove_where only drops entries whose value matches."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    cache.remove_where(lambda value: value % 2 == 1)
+
+    assert cache.get("a") is None, "Expected 'a' to be removed"
+    assert cache.get("c") is None, "Expected 'c' to be removed"
+    assert cache.get("b") == 2, f"Expected 2, got {cache.get('b')}"
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Test script for the keyset pagination cursor helpers.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from src.utils.cursor import encode_cursor, decode_cursor
+
+
+def test_round_trip():
+    """Test that a decoded cursor gives back the encoded position."""
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+
+    decoded = decode_cursor(encode_cursor(created_at, row_id))
+    assert decoded.is_some(), f"Expected Some, got {decoded}"
+    assert decoded.unwrap() == (created_at, row_id), f"Expected {(created_at, row_id)}, got {decoded.unwrap()}"
+
+
+def test_malformed_cursor():
+    """Test that malformed cursors decode to Nothing instead of raising."""
+    for cursor in ["", "not-base64!", encode_cursor(datetime.now(), uuid.uuid4())[:-6], "Zm9vfGJhcg=="]:
+        decoded = decode_cursor(cursor)
+        assert decoded.is_nothing(), f"Expected Nothing for {cursor!r}, got {decoded}"
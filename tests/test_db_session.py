@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-request database session.
+"""
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.models.base import get_db
+
+
+def build_client(seen: list) -> TestClient:
+    """App whose route and one of its dependencies both ask for a session."""
+    app = FastAPI()
+
+    async def current_user(db=Depends(get_db)):
+        return db
+
+    @app.get("/")
+    async def route(user_db=Depends(current_user), db=Depends(get_db)):
+        seen.append((user_db, db))
+
+    return TestClient(app)
+
+
+def test_one_session_per_request():
+    """Test that a request shares one session and the next one gets a new one."""
+    seen = []
+    client = build_client(seen)
+    client.get("/")
+    client.get("/")
+
+    (first_user_db, first_db), (second_user_db, _) = seen
+    assert first_user_db is first_db, "Expected one session within a request"
+    assert first_db is not second_user_db, "Session leaked between requests"
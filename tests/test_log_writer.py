@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the buffered log writer.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.core import log_writer
+
+
+def make_row(poison=False):
+    return {"id": uuid.uuid4(), "project_id": uuid.uuid4(), "poison": poison}
+
+
+@pytest.fixture
+def inserts(monkeypatch):
+    """Record every INSERT the writer issues; rows marked poison make it fail."""
+    calls = []
+
+    async def insert_rows(rows):
+        if any(row["poison"] for row in rows):
+            raise IntegrityError("INSERT INTO logs", {}, Exception("foreign key violation"))
+        calls.append(list(rows))
+
+    monkeypatch.setattr(log_writer, "_insert_rows", insert_rows)
+    # The module queue binds to the first loop that waits on it: one per test
+    monkeypatch.setattr(log_writer, "_queue", asyncio.Queue())
+    return calls
+
+
+def test_rows_written_in_one_batch(inserts):
+    """Test that rows queued together go out in a single INSERT."""
+    rows = [make_row() for _ in range(3)]
+
+    async def run():
+        for row in rows:
+            assert log_writer.enqueue_log(row), "Expected the queue to accept the row"
+        writer = asyncio.create_task(log_writer.run_log_writer())
+        await asyncio.sleep(log_writer.FLUSH_INTERVAL * 4)
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+
+    asyncio.run(run())
+    assert inserts == [rows], f"Expected one batch of 3 rows, got {inserts}"
+
+
+def test_shutdown_flushes_in_flight_and_pending_rows(monkeypatch, inserts):
+    """Test that cancelling the writer mid-write loses neither that batch nor the queue."""
+    written = []
+    started = asyncio.Event()
+
+    async def slow_insert(rows):
+        started.set()
+        await asyncio.sleep(0.1)
+        written.extend(rows)
+
+    monkeypatch.setattr(log_writer, "_insert_rows", slow_insert)
+    first, second = make_row(), make_row()
+
+    async def run():
+        log_writer.enqueue_log(first)
+        writer = asyncio.create_task(log_writer.run_log_writer())
+        await started.wait()
+        log_writer.enqueue_log(second)
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+
+    asyncio.run(run())
+    assert written == [first, second], f"Expected both rows written, got {written}"
+
+
+def test_poison_row_only_drops_itself(inserts):
+    """Test that a row rejected by the database does not take its batch down."""
+    rows = [make_row() for _ in range(7)]
+    poison = make_row(poison=True)
+    rows.insert(3, poison)
+
+    asyncio.run(log_writer._write_batch(rows))
+
+    written = [row for call in inserts for row in call]
+    assert poison not in written, "Expected the poison row to be dropped"
+    assert len(written) == 7, f"Expected the 7 valid rows written, got {len(written)}"
+
+
+def test_unreachable_database_retries_without_dropping(monkeypatch, inserts):
+    """Test that a batch is retried, not dropped, while the database is unreachable."""
+    failures = []
+
+    async def flaky_insert(rows):
+        if len(failures) < 2:
+            failures.append(rows)
+            raise OperationalError("INSERT INTO logs", {}, Exception("connection reset"))
+        inserts.append(list(rows))
+
+    monkeypatch.setattr(log_writer, "_insert_rows", flaky_insert)
+    monkeypatch.setattr(log_writer, "RETRY_DELAY", 0.01)
+    rows = [make_row() for _ in range(3)]
+
+    async def run():
+        for row in rows:
+            log_writer.enqueue_log(row)
+        writer = asyncio.create_task(log_writer.run_log_writer())
+        await asyncio.sleep(log_writer.FLUSH_INTERVAL + 0.2)
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+
+    asyncio.run(run())
+    assert len(failures) == 2, f"Expected 2 failed attempts, got {len(failures)}"
+    assert inserts == [rows], f"Expected the batch written once after the retries, got {inserts}"
+
+
+def test_queue_not_drained_while_database_unreachable(monkeypatch, inserts):
+    """Test that the writer stops taking rows while its batch cannot be written."""
+    async def failing_insert(rows):
+        raise OperationalError("INSERT INTO logs", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(log_writer, "_insert_rows", failing_insert)
+    monkeypatch.setattr(log_writer, "RETRY_DELAY", 0.01)
+
+    async def run():
+        log_writer.enqueue_log(make_row())
+        writer = asyncio.create_task(log_writer.run_log_writer())
+        await asyncio.sleep(log_writer.FLUSH_INTERVAL + 0.05)
+        log_writer.enqueue_log(make_row())
+        await asyncio.sleep(0.1)
+        pending = log_writer._queue.qsize()
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+        return pending
+
+    pending = asyncio.run(run())
+    assert pending == 1, f"Expected the new row to stay queued, got {pending} queued"
@@ -3,95 +3,55 @@
 Test script for the match function implementation.
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-from utils.result import Ok, Err, match, Result
-
-
-def test_basic_success():
-    """Test basic success case with numeric values."""
-    result = Ok(42)
-    value = match(
-        result,
-        on_success=lambda x: x * 2,
-        on_error=lambda e: 0
-    )
-    assert value == 84, f"Expected 84, got {value}"
-
-
-def test_basic_error():
-    """Test basic error case with string errors."""
-    result = Err("Not found")
-    value = match(
-        result,
-        on_success=lambda x: x * 2,
-        on_error=lambda e: 0
-    )
-    assert value == 0, f"Expected 0, got {value}"
-
-
-def test_type_specific_handling():
-    """Test type-specific handling with custom functions."""
-    # Test success with string
-    result = Ok("data")
-    result_str = match(
-        result,
-        on_success=lambda r: f"Success: {r}",
-        on_error=lambda e: f"Error: {e}"
-    )
-    assert result_str == "Success: data", f"Expected 'Success: data', got {result_str}"
-
-    # Test error with string
-    result = Err("error message")
-    result_str = match(
-        result,
-        on_success=lambda r: f"Success: {r}",
-        on_error=lambda e: f"Error: {e}"
-    )
-    assert result_str == "Error: error message", f"Expected 'Error: error message', got {result_str}"
-
-
-def test_different_return_types():
-    """Test functions that return different types."""
-    result = Ok(42)
-    value = match(
-        result,
-        on_success=lambda x: str(x),
-        on_error=lambda e: None
-    )
-    assert value == "42", f"Expected '42', got {value}"
-    assert isinstance(value, str), f"Expected str, got {type(value)}"
-
-    result = Err("error")
-    value = match(
-        result,
-        on_success=lambda x: str(x),
-        on_error=lambda e: None
-    )
-    assert value is None, f"Expected None, got {value}"
-
-
-def test_edge_cases():
-    """Test edge cases with None values."""
-    # Test with None success
-    result = Ok(None)
-    value = match(
-        result,
-        on_success=lambda x: "None handled" if x is None else "Not none",
-        on_error=lambda e: "Error"
-    )
-    assert value == "None handled", f"Expected 'None handled', got {value}"
-
-    # Test with None error
-    result = Err(None)
-    value = match(
-        result,
-        on_success=lambda x: "Success",
-        on_error=lambda e: "None error" if e is None else "Not none error"
-    )
-    assert value == "None error", f"Expected 'None error', got {value}"
+import pytest
+
+from src.utils.result import Ok, Err, match, Result
+
+
+# Callbacks shared by the tests, built once at import
+_double = lambda x: x * 2
+_zero = lambda e: 0
+_fmt_ok = lambda r: f"Success: {r}"
+_fmt_err = lambda e: f"Error: {e}"
+_none = lambda e: None
+_ok_none = lambda x: "None handled" if x is None else "Not none"
+_err_none = lambda e: "None error" if e is None else "Not none error"
+_fail = lambda _: 1 / 0  # raises ZeroDivisionError
+_identity = lambda x: x
+
+
+def handle_success(value: int) -> str:
+    return f"Success: {value}"
+
+
+def handle_error(error: str) -> str:
+    return f"Error: {error}"
+
+
+@pytest.mark.parametrize(
+    "result,on_success,on_error,expected",
+    [
+        # Basic usage with numeric values and string errors
+        (Ok(42), _double, _zero, 84),
+        (Err("Not found"), _double, _zero, 0),
+        # Type-specific handling
+        (Ok("data"), _fmt_ok, _fmt_err, "Success: data"),
+        (Err("error message"), _fmt_ok, _fmt_err, "Error: error message"),
+        (Ok(42), handle_success, handle_error, "Success: 42"),
+        (Err("error message"), handle_success, handle_error, "Error: error message"),
+        # Callbacks returning different types
+        (Ok(42), str, _none, "42"),
+        (Err("error"), str, _none, None),
+        # None values
+        (Ok(None), _ok_none, lambda e: "Error", "None handled"),
+        (Err(None), lambda x: "Success", _err_none, "None error"),
+    ],
+)
+def test_match_dispatch(result, on_success, on_error, expected):
+    """Test that match calls the callback of the result's branch."""
+    value = result.match(on_success, on_error)
+    assert value == expected, f"Expected {expected!r}, got {value!r}"
+    assert type(value) is type(expected), f"Expected {type(expected)}, got {type(value)}"
 
 
 def test_exception_handling_in_callbacks():
@@ -100,11 +60,7 @@ def test_exception_handling_in_callbacks():
 
     # Test callback that raises exception
     try:
-        match(
-            result,
-            on_success=lambda x: 1 / 0,  # This will raise ZeroDivisionError
-            on_error=lambda e: "error"
-        )
+        result.match(_fail, _fmt_err)
         raise AssertionError("Expected ZeroDivisionError to be raised")
     except ZeroDivisionError:
         pass
@@ -112,75 +68,47 @@ def test_exception_handling_in_callbacks():
     result = Err("test")
 
     try:
-        match(
-            result,
-            on_success=lambda x: "success",
-            on_error=lambda e: 1 / 0  # This will raise ZeroDivisionError
-        )
+        result.match(_fmt_ok, _fail)
         raise AssertionError("Expected ZeroDivisionError to be raised")
     except ZeroDivisionError:
         pass
 
 
-def test_usage_examples_from_issue():
-    """Test the usage examples provided in the issue description."""
-    # Basic Usage example
-    result = Ok(42)
-    value = match(
-        result,
-        on_success=lambda x: x * 2,
-        on_error=lambda e: 0
-    )
-    assert value == 84, f"Expected 84, got {value}"
+def match_statement(result, on_success, on_error):
+    """Dispatch with a match statement instead of a call to match()."""
+    match result:
+        case Ok(value):
+            return on_success(value)
+        case Err(error):
+            return on_error(error)
 
-    result = Err("Not found")
-    value = match(
-        result,
-        on_success=lambda x: x * 2,
-        on_error=lambda e: 0
-    )
-    assert value == 0, f"Expected 0, got {value}"
 
-    # Type-Specific Handling example
-    def handle_success(value: int) -> str:
-        return f"Success: {value}"
+@pytest.mark.parametrize("result,expected", [(Ok(42), 84), (Err("Not found"), 0)])
+def test_structural_pattern_matching(result, expected):
+    """Test that Ok and Err can be destructured by a match statement."""
+    value = match_statement(result, _double, _zero)
+    assert value == expected, f"Expected {expected!r}, got {value!r}"
 
-    def handle_error(error: str) -> str:
-        return f"Error: {error}"
 
-    result = Ok(42)
-    result_str = match(
-        result,
-        on_success=handle_success,
-        on_error=handle_error
-    )
-    assert result_str == "Success: 42", f"Expected 'Success: 42', got {result_str}"
+def test_match_function():
+    """Test that the free match() function dispatches like the methods."""
+    value = match(Ok(42), _double, _zero)
+    assert value == 84, f"Expected 84, got {value}"
 
-    result = Err("error message")
-    result_str = match(
-        result,
-        on_success=handle_success,
-        on_error=handle_error
-    )
-    assert result_str == "Error: error message", f"Expected 'Error: error message', got {result_str}"
+    value = match(Err("Not found"), _double, _zero)
+    assert value == 0, f"Expected 0, got {value}"
 
 
 def test_instance_method_match():
     """Test the new instance method match() on Result objects."""
     # Basic Usage: Success case
     result = Ok(42)
-    matched_value = result.match(
-        on_success=lambda x: f"Success: {x}",
-        on_error=lambda e: f"Error: {e}"
-    )
+    matched_value = result.match(on_success=_fmt_ok, on_error=_fmt_err)
     assert matched_value == "Success: 42", f"Expected 'Success: 42', got {matched_value}"
 
     # Basic Usage: Error case
     result = Err("Something went wrong")
-    matched_value = result.match(
-        on_success=lambda x: f"Success: {x}",
-        on_error=lambda e: f"Error: {e}"
-    )
+    matched_value = result.match(on_success=_fmt_ok, on_error=_fmt_err)
     assert matched_value == "Error: Something went wrong", f"Expected 'Error: Something went wrong', got {matched_value}"
 
     # Advanced Usage: Helper function
@@ -216,18 +144,12 @@ def test_instance_method_match():
 
     # Test that method doesn't use * syntax
     result = Ok(42)
-    matched_value = result.match(
-        on_success=lambda x: x * 2,
-        on_error=lambda e: 0
-    )
+    matched_value = result.match(on_success=_double, on_error=_zero)
     assert matched_value == 84, f"Expected 84, got {matched_value}"
 
     # Test with different return types
     result = Ok("hello")
-    matched_str = result.match(
-        on_success=lambda x: x.upper(),
-        on_error=lambda e: "ERROR"
-    )
+    matched_str = result.match(on_success=str.upper, on_error=lambda e: "ERROR")
     assert matched_str == "HELLO", f"Expected 'HELLO', got {matched_str}"
     assert isinstance(matched_str, str), f"Expected str, got {type(matched_str)}"
 
@@ -237,4 +159,31 @@ def test_instance_method_match():
         on_success=lambda x: "success",
         on_error=lambda e: f"ERROR: {e}"
     )
-    assert matched_result == "ERROR: test error", f"Expected 'ERROR: test error', got {matched_result}"
\ No newline at end of file
+    assert matched_result == "ERROR: test error", f"Expected 'ERROR: test error', got {matched_result}"
+
+
+def test_unchecked_map_and_bind():
+    """Test map_unchecked/bind_unchecked: exceptions propagate, unchanged values keep the instance."""
+    result = Ok(42)
+    assert result.map_unchecked(_identity) is result, "Expected the same Ok for an unchanged value"
+    assert result.map_unchecked(lambda x: x + 1).unwrap() == 43, "Expected the mapped value"
+    assert result.bind_unchecked(lambda x: Err("bad")).unwrap_err() == "bad", "Expected the bound Err"
+
+    try:
+        result.map_unchecked(_fail)
+        assert False, "Expected ZeroDivisionError to propagate"
+    except ZeroDivisionError:
+        pass
+    assert result.map(_fail).is_err(), "Expected the checked map to return an Err"
+
+    error = Err("Not found")
+    assert error.map_unchecked(_fail) is error, "Expected the Err to propagate"
+    assert error.bind_unchecked(_fail) is error, "Expected the Err to propagate"
+
+
+def test_unwrap_err_keeps_traceback():
+    """Test that an exception caught into an Err keeps its traceback."""
+    result = Ok(42).map(_fail)
+    error = result.unwrap_err()
+    assert isinstance(error, ZeroDivisionError), f"Expected ZeroDivisionError, got {error!r}"
+    assert error.__traceback__ is not None, "Expected the original traceback to be kept"
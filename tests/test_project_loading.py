@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the project list queries: loader options, keyset pagination
+and batched API key loading.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from src.models.base import Base
+from src.models.user import User
+from src.models.project import Project
+from src.models.api_key import APIKey
+from src.core.project import (
+    _STMT_PROJECTS_BY_OWNER,
+    _STMT_PROJECTS_BY_OWNER_AFTER,
+    _STMT_PROJECTS_WITH_API_KEY,
+)
+
+
+@pytest.fixture
+def session():
+    """In-memory database holding one user with two projects, the newest with an API key."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__, Project.__table__, APIKey.__table__])
+
+    with Session(engine) as db:
+        now = datetime.now(timezone.utc)
+        owner_id = uuid.uuid4()
+        db.add(User(id=owner_id, email="owner@example.com", password_hash="x", created_at=now))
+        db.add_all(
+            Project(id=uuid.uuid4(), name=name, owner_id=owner_id, created_at=now + timedelta(seconds=offset))
+            for offset, name in enumerate(("first", "second"))
+        )
+        db.flush()
+        second = db.scalars(select(Project).where(Project.name == "second")).one()
+        db.add(APIKey(key_hash="hash", project_id=second.id, is_active=True, created_at=now))
+        db.commit()
+        db.expunge_all()
+        yield db, owner_id
+
+
+def test_list_loads_projects(session):
+    """Test that listing projects works without touching relationships."""
+    db, owner_id = session
+
+    projects = db.scalars(_STMT_PROJECTS_BY_OWNER, {"owner_id": owner_id, "limit": 10}).all()
+
+    assert len(projects) == 2, f"Expected 2 projects, got {len(projects)}"
+    assert {project.name for project in projects} == {"first", "second"}, "Unexpected project names"
+
+
+def test_list_forbids_lazy_loads(session):
+    """Test that reading a relationship of a listed project raises instead of querying."""
+    db, owner_id = session
+
+    project = db.scalars(_STMT_PROJECTS_BY_OWNER, {"owner_id": owner_id, "limit": 10}).first()
+
+    with pytest.raises(InvalidRequestError):
+        project.logs
+
+
+def test_list_pages_with_cursor(session):
+    """Test that the next page starts strictly after the cursor."""
+    db, owner_id = session
+
+    first_page = db.scalars(_STMT_PROJECTS_BY_OWNER, {"owner_id": owner_id, "limit": 1}).all()
+    assert [project.name for project in first_page] == ["second"], "Newest project should come first"
+
+    last = first_page[-1]
+    next_page = db.scalars(
+        _STMT_PROJECTS_BY_OWNER_AFTER,
+        {"owner_id": owner_id, "limit": 1, "cursor_created_at": last.created_at, "cursor_id": last.id},
+    ).all()
+    assert [project.name for project in next_page] == ["first"], "Second page should hold the older project"
+
+
+def test_list_loads_api_keys_in_one_query(session):
+    """Test that a page of projects and their API keys takes two statements."""
+    db, owner_id = session
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    projects = db.scalars(_STMT_PROJECTS_WITH_API_KEY, {"owner_id": owner_id, "limit": 10}).all()
+    keys = {project.name: project.active_api_key for project in projects}
+
+    assert len(statements) <= 2, f"Expected at most 2 statements, got {len(statements)}"
+    assert keys["second"] is not None and keys["first"] is None, f"Unexpected API keys: {keys}"